@@ -37,7 +37,8 @@ export default function Dashboard() {
     setResult(null);
 
     try {
-      const response = await fetch('http://localhost:5001/api/evaluate', {
+      // Votes stream in as each agent finishes, then the final decision
+      const response = await fetch('http://localhost:5001/api/evaluate/stream', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -53,16 +54,40 @@ export default function Dashboard() {
         }),
       });
 
-      const data = await response.json();
-      
-      if (data.success) {
-        const votes = data.result.agent_votes;
-        for (let i = 0; i < votes.length; i++) {
-          await new Promise(resolve => setTimeout(resolve, 1000));
-          setResult((prev: any) => ({
-            ...data.result,
-            agent_votes: votes.slice(0, i + 1)
-          }));
+      if (!response.ok || !response.body) {
+        throw new Error(`Request failed with status ${response.status}`);
+      }
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        const events = buffer.split('\n\n');
+        buffer = events.pop() || '';
+
+        for (const raw of events) {
+          const eventLine = raw.split('\n').find(line => line.startsWith('event: '));
+          const dataLine = raw.split('\n').find(line => line.startsWith('data: '));
+          if (!eventLine || !dataLine) continue;
+
+          const event = eventLine.slice('event: '.length);
+          const data = JSON.parse(dataLine.slice('data: '.length));
+
+          if (event === 'vote') {
+            setResult((prev: any) => ({
+              ...(prev || {}),
+              agent_votes: [...(prev?.agent_votes || []), data]
+            }));
+          } else if (event === 'decision') {
+            setResult(data);
+          } else if (event === 'error') {
+            throw new Error(data.error);
+          }
         }
       }
     } catch (error) {
@@ -338,7 +363,7 @@ export default function Dashboard() {
               ))}
             </AnimatePresence>
 
-            {result && result.agent_votes && result.agent_votes.length === 5 && (
+            {result && result.agent_votes && result.approved !== undefined && (
               <motion.div
                 initial={{ opacity: 0, scale: 0.95 }}
                 animate={{ opacity: 1, scale: 1 }}
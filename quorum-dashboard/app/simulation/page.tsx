@@ -60,6 +60,24 @@ export default function SimulationPage() {
     }
   };
 
+  // Simulations run as background jobs; poll until the job finishes
+  const waitForJob = async (jobId: string): Promise<SimulationResult> => {
+    while (true) {
+      await new Promise(resolve => setTimeout(resolve, 2000));
+      const response = await fetch(`http://localhost:5001/api/jobs/${jobId}`);
+      const data = await response.json();
+      if (!data.success) {
+        throw new Error(data.error || 'Failed to load simulation job');
+      }
+      if (data.job.status === 'completed') {
+        return data.job.result;
+      }
+      if (data.job.status === 'failed') {
+        throw new Error(data.job.error || 'Simulation failed');
+      }
+    }
+  };
+
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
     setLoading(true);
@@ -78,9 +96,10 @@ export default function SimulationPage() {
       });
 
       const data = await response.json();
-      
+
       if (data.success) {
-        setSimulations(prev => [data.result, ...prev]);
+        const result = await waitForJob(data.job_id);
+        setSimulations(prev => [result, ...prev]);
         setFormData({
           agent_name: '',
           goal: '',
@@ -0,0 +1,149 @@
+import os
+import random
+import threading
+from typing import Dict, List, Optional
+
+from metrics import estimate_tokens
+
+# Amount bands (upper bounds, USD) used to bucket request features
+AMOUNT_BANDS = (100, 1000, 10000)
+
+
+def amount_band(amount) -> str:
+    try:
+        value = float(amount)
+    except (TypeError, ValueError):
+        return 'unknown'
+    for bound in AMOUNT_BANDS:
+        if value < bound:
+            return f"<{bound}"
+    return f">={AMOUNT_BANDS[-1]}"
+
+
+def request_features(purchase_request: Dict) -> str:
+    """
+    Feature bucket for routing history: amount band and urgency.
+    """
+    urgency = str(purchase_request.get('urgency', 'Medium')).strip().lower()
+    return f"{amount_band(purchase_request.get('amount'))}|{urgency}"
+
+
+class _AgentStats:
+    def __init__(self):
+        self.samples = 0
+        self.agreed = 0
+        self.latency_ms = 0.0
+        self.tokens = 0
+
+    @property
+    def agreement(self) -> float:
+        return self.agreed / self.samples if self.samples else 0.0
+
+    @property
+    def mean_latency_ms(self) -> float:
+        return self.latency_ms / self.samples if self.samples else 0.0
+
+    @property
+    def mean_tokens(self) -> float:
+        return self.tokens / self.samples if self.samples else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "samples": self.samples,
+            "agreement": round(self.agreement, 3),
+            "mean_latency_ms": round(self.mean_latency_ms, 1),
+            "mean_tokens": round(self.mean_tokens, 1)
+        }
+
+
+class AgentRouter:
+    """
+    Learns, per agent and request bucket (amount band + urgency), how often the
+    agent's vote agreed with the final outcome, how long it took and how many
+    tokens it cost. Agents that agreed at least min_agreement of the time over
+    min_samples decisions are deferred: they only vote if the other agents
+    leave the outcome open. The quorum rule itself never changes, a deferred
+    agent is skipped only when its vote could not change the result.
+
+    At most len(roster) - approval_threshold agents are deferred, most expensive
+    (latency x tokens) first, and explore_rate of decisions consult everyone so
+    the history of deferred agents keeps updating.
+    """
+
+    def __init__(self, min_samples: int = 20, min_agreement: float = 0.95,
+                 explore_rate: float = 0.1, seed: Optional[int] = None):
+        self.min_samples = min_samples
+        self.min_agreement = min_agreement
+        self.explore_rate = explore_rate
+        self._random = random.Random(seed)
+        self._stats = {}  # (agent name, feature bucket) -> _AgentStats
+        self._lock = threading.Lock()
+
+    def plan(self, agents: List[Dict], purchase_request: Dict, approval_threshold: int) -> Dict:
+        """
+        Split the roster for one request. Returns {agent name: reason} for the
+        agents to defer (empty when exploring or without enough history).
+        """
+        max_deferred = len(agents) - approval_threshold
+        if max_deferred <= 0 or self._random.random() < self.explore_rate:
+            return {}
+
+        bucket = request_features(purchase_request)
+        candidates = []
+        with self._lock:
+            for agent in agents:
+                stats = self._stats.get((agent['name'], bucket))
+                if stats is None or stats.samples < self.min_samples:
+                    continue
+                if stats.agreement >= self.min_agreement:
+                    cost = stats.mean_latency_ms * max(stats.mean_tokens, 1)
+                    reason = (f"agreed with the outcome in {stats.agreement:.0%} of {stats.samples} "
+                              f"'{bucket}' decisions, ~{stats.mean_latency_ms:.0f}ms per vote")
+                    candidates.append((cost, agent['name'], reason))
+
+        candidates.sort(reverse=True)
+        return {name: reason for _, name, reason in candidates[:max_deferred]}
+
+    def record(self, purchase_request: Dict, result: Dict):
+        """
+        Learn from a quorum decision: every YES/NO vote counts as agreeing when
+        it matches the outcome. Abstains carry no signal and are ignored.
+        """
+        bucket = request_features(purchase_request)
+        outcome = 'YES' if result['approved'] else 'NO'
+        with self._lock:
+            for vote in result['agent_votes']:
+                if vote['vote'] not in ('YES', 'NO'):
+                    continue
+                stats = self._stats.get((vote['agent_name'], bucket))
+                if stats is None:
+                    stats = self._stats[(vote['agent_name'], bucket)] = _AgentStats()
+                stats.samples += 1
+                stats.agreed += vote['vote'] == outcome
+                stats.latency_ms += vote.get('latency_ms') or 0
+                stats.tokens += estimate_tokens(vote.get('reasoning'))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            by_agent = {}
+            for (name, bucket), stats in sorted(self._stats.items()):
+                by_agent.setdefault(name, {})[bucket] = stats.to_dict()
+        return {
+            "min_samples": self.min_samples,
+            "min_agreement": self.min_agreement,
+            "explore_rate": self.explore_rate,
+            "agents": by_agent
+        }
+
+
+def create_agent_router() -> Optional[AgentRouter]:
+    """
+    Router configured from the environment; None unless QUORUM_ADAPTIVE_ROUTING=on.
+    """
+    if os.getenv('QUORUM_ADAPTIVE_ROUTING', 'off').lower() not in ('on', 'true', '1'):
+        return None
+    return AgentRouter(
+        min_samples=int(os.getenv('QUORUM_ROUTING_MIN_SAMPLES', '20')),
+        min_agreement=float(os.getenv('QUORUM_ROUTING_MIN_AGREEMENT', '0.95')),
+        explore_rate=float(os.getenv('QUORUM_ROUTING_EXPLORE_RATE', '0.1'))
+    )
@@ -1,9 +1,26 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
-import asyncio
 import sys
+import asyncio
 import os
+import json
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
 from concensus import AgentConsensusSystem
+from event_loop import background_loop
+from jobs import JobManager, JobQueueFull
+from result_store import ResultStore
+from records import ROSTER, VOTE_FIELDS, DecisionRecord, SimulationRecord
+from metrics import REGISTRY
+from decision_cache import create_decision_cache
+from policy import load_policy
+from agent_router import create_agent_router
+from provider_health import provider_health
+from scheduler import admission_scheduler
+from similarity_index import create_similarity_index
+from escalation import load_tiers
 
 # Try to import the simulation system
 try:
@@ -16,9 +33,202 @@ except ImportError as e:
 app = Flask(__name__)
 CORS(app)
 
-# Global state to store latest results
-latest_results = []
-simulation_results = []
+# Decision cache shared by all requests (QUORUM_CACHE=memory|sqlite|none)
+_cache_backend = os.getenv('QUORUM_CACHE', 'memory')
+_cache_options = {
+    "max_entries": int(os.getenv('QUORUM_CACHE_SIZE', '1024')),
+    "ttl": float(os.getenv('QUORUM_CACHE_TTL', '3600'))
+}
+if _cache_backend == 'sqlite':
+    _cache_options["path"] = os.getenv('QUORUM_CACHE_PATH', 'decision_cache.db')
+decision_cache = create_decision_cache(_cache_backend, **_cache_options)
+
+# Reuse decisions on reworded near-duplicate requests (QUORUM_SIMILARITY=on)
+similarity_index = create_similarity_index()
+
+# Deterministic rules run before the quorum (QUORUM_POLICY_PATH, 'none' to disable)
+policy = load_policy()
+
+# Adaptive agent routing (QUORUM_ADAPTIVE_ROUTING=on), off by default
+agent_router = create_agent_router()
+
+# Cheap agents first, the rest only on split votes (QUORUM_TIERS_PATH), off by default
+escalation_tiers = load_tiers()
+
+# One consensus system per process; it uses the pooled Dedalus client
+consensus_system = AgentConsensusSystem(cache=decision_cache, policy=policy, router=agent_router,
+                                         similarity_index=similarity_index, tiers=escalation_tiers)
+
+# Batch evaluation limits
+MAX_BATCH_SIZE = int(os.getenv('QUORUM_MAX_BATCH_SIZE', '500'))
+BATCH_CONCURRENCY = int(os.getenv('QUORUM_BATCH_CONCURRENCY', '16'))
+MAX_VOTES_PER_PROMPT = 25
+
+# Recent results in memory, full history in SQLite (QUORUM_RESULTS_DB=none for memory only)
+_results_db = os.getenv('QUORUM_RESULTS_DB', 'quorum_results.db')
+if _results_db.lower() == 'none':
+    _results_db = None
+_max_recent = int(os.getenv('QUORUM_RESULTS_RECENT', '500'))
+latest_results = ResultStore('decisions', path=_results_db, max_recent=_max_recent,
+                             record_type=DecisionRecord)
+simulation_results = ResultStore('simulations', path=_results_db, max_recent=_max_recent,
+                                 record_type=SimulationRecord)
+
+# Late votes (QUORUM_FINISH_IN_BACKGROUND=on) land after the decision was
+# returned and stored, so they are written back to the stored copies by
+# decision_id. Only decisions whose round still has votes running wait for
+# them; votes that beat the store are held until it happens. Both maps are
+# bounded in case a round never reports back.
+_late_votes_lock = threading.Lock()
+_awaiting_late_votes = OrderedDict()  # decision_id -> [(result id, stored result)]
+_early_late_votes = OrderedDict()  # decision_id -> late votes not stored yet
+MAX_LATE_VOTE_ENTRIES = 1000
+
+def _bounded_put(entries, key, value):
+    entries[key] = value
+    while len(entries) > MAX_LATE_VOTE_ENTRIES:
+        entries.popitem(last=False)
+
+def _store_decision(result):
+    decision_id = result.get('decision_id')
+    with _late_votes_lock:
+        if decision_id in _early_late_votes:
+            # Kept (until it ages out) for coalesced callers storing the same decision
+            result = dict(result, late_votes=_early_late_votes[decision_id])
+        result_id = latest_results.append(
+            result,
+            requesting_agent=result['purchase_request'].get('requesting_agent'),
+            approved=result['approved']
+        )
+        if consensus_system.late_votes_pending(decision_id):
+            targets = _awaiting_late_votes.get(decision_id, [])
+            _bounded_put(_awaiting_late_votes, decision_id, targets + [(result_id, result)])
+
+def _record_late_votes(decision_id, late_votes):
+    """
+    consensus_system.on_late_votes: update every stored copy of the decision.
+    The SQLite writes run off the event loop.
+    """
+    with _late_votes_lock:
+        targets = _awaiting_late_votes.pop(decision_id, None)
+        if targets is None:
+            _bounded_put(_early_late_votes, decision_id, late_votes)
+            return
+
+    def update():
+        for result_id, result in targets:
+            latest_results.update(result_id, dict(result, late_votes=late_votes))
+
+    asyncio.get_running_loop().run_in_executor(None, update)
+
+consensus_system.on_late_votes = _record_late_votes
+
+def _store_simulation(result):
+    simulation_results.append(result, requesting_agent=result.get('agent'))
+
+# Listings at least this big are gzipped for clients that accept it
+GZIP_MIN_BYTES = 1024
+
+# Part of every listing ETag, so tags from an earlier process (whose result
+# ids may be reused, e.g. with QUORUM_RESULTS_DB=none) never match
+_ETAG_EPOCH = os.urandom(8).hex()
+
+def _json_response(body, etag=None):
+    """
+    JSON response, gzipped when large and accepted (gzip;q=0 refuses it).
+    An etag gets the content coding appended, so the gzip and identity bodies
+    never share a tag.
+    """
+    data = app.json.dumps(body).encode('utf-8')
+    response = Response(data, mimetype='application/json')
+    coding = None
+    if len(data) >= GZIP_MIN_BYTES and request.accept_encodings['gzip'] > 0:
+        response.set_data(gzip.compress(data, compresslevel=6))
+        response.headers['Content-Encoding'] = coding = 'gzip'
+    response.vary.add('Accept-Encoding')
+    if etag is not None:
+        response.set_etag(f"{etag}-{coding}" if coding else etag)
+    return response
+
+def _listing(key, store):
+    """
+    Page of a ResultStore for polling clients. Items carry their result_id;
+    pass the body's cursor back as ?since= to get only newer items (oldest
+    first, with has_more set while more are waiting). The ETag covers a
+    per-process epoch, the newest id, the store's revision (bumped when late
+    votes update an item) and the query, so an unchanged poll gets a 304
+    before anything is serialized.
+    ?view=compact sends votes as arrays (see records.VOTE_FIELDS) that
+    reference the agent roster by id.
+    """
+    etag = hashlib.sha1(
+        f"{_ETAG_EPOCH}:{store.last_id}.{store.revision}:{request.full_path}".encode('utf-8')
+    ).hexdigest()
+    # Either coding's tag is current: the body is the same, only its encoding differs
+    for current in (etag, f"{etag}-gzip"):
+        if request.if_none_match.contains(current):
+            response = Response(status=304)
+            response.set_etag(current)
+            response.vary.add('Accept-Encoding')
+            return response
+
+    args = _page_args()
+    page = store.list(**args)
+    verbose = request.args.get('view', 'verbose') != 'compact'
+    body = {
+        "success": True,
+        key: [dict(record.to_dict(verbose), result_id=item_id)
+              for item_id, record in zip(page['ids'], page['items'])],
+        "total": page['total'],
+        "cursor": page['cursor'],
+        "has_more": page['has_more'],
+        "limit": args['limit'],
+        "offset": args['offset']
+    }
+    if args['since'] is not None:
+        body['since'] = args['since']
+    if not verbose:
+        body['roster'] = ROSTER.to_list()
+        body['vote_fields'] = list(VOTE_FIELDS)
+
+    return _json_response(body, etag)
+
+def _page_args():
+    """
+    limit/offset/requesting_agent/approved/since query args for paginated listings
+    """
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    approved = request.args.get('approved')
+    if approved is not None:
+        approved = approved.lower() in ('1', 'true', 'yes')
+    return {
+        "limit": limit,
+        "offset": offset,
+        "requesting_agent": request.args.get('requesting_agent'),
+        "approved": approved,
+        "since": request.args.get('since', type=int)
+    }
+
+# Simulations run as background jobs on a bounded worker pool
+simulation_jobs = JobManager(
+    max_workers=int(os.getenv('QUORUM_SIMULATION_WORKERS', '4')),
+    max_jobs=int(os.getenv('QUORUM_SIMULATION_MAX_JOBS', '500'))
+)
+
+def _purchase_request_from(data):
+    """
+    Build a purchase request from a JSON body (or query args)
+    """
+    return {
+        "amount": data.get('amount'),
+        "purpose": data.get('purpose'),
+        "requesting_agent": data.get('requesting_agent'),
+        "justification": data.get('justification'),
+        "expected_roi": data.get('expected_roi', 'Not specified'),
+        "urgency": data.get('urgency', 'Medium'),
+        "budget_remaining": data.get('budget_remaining', 10000)
+    }
 
 @app.route('/api/evaluate', methods=['POST'])
 def evaluate_purchase():
@@ -28,22 +238,17 @@ def evaluate_purchase():
     try:
         data = request.json
         
-        purchase_request = {
-            "amount": data.get('amount'),
-            "purpose": data.get('purpose'),
-            "requesting_agent": data.get('requesting_agent'),
-            "justification": data.get('justification'),
-            "expected_roi": data.get('expected_roi', 'Not specified'),
-            "urgency": data.get('urgency', 'Medium'),
-            "budget_remaining": data.get('budget_remaining', 10000)
-        }
+        purchase_request = _purchase_request_from(data)
         
         # Run the consensus system
-        consensus_system = AgentConsensusSystem()
-        result = asyncio.run(consensus_system.evaluate_purchase(purchase_request))
+        result = background_loop.run(consensus_system.evaluate_purchase(
+            purchase_request,
+            early_exit=bool(data.get('early_exit', False)),
+            include_timings=bool(data.get('timings', False))
+        ))
         
         # Store in global state
-        latest_results.append(result)
+        _store_decision(result)
         
         return jsonify({
             "success": True,
@@ -56,10 +261,105 @@ def evaluate_purchase():
             "error": str(e)
         }), 500
 
+@app.route('/api/evaluate/batch', methods=['POST'])
+def evaluate_batch():
+    """
+    Evaluate many purchase requests at once: {"requests": [...]}.
+    Results come back in input order with per-item success/error.
+    Optional "votes_per_prompt": K (a positive integer, capped at
+    MAX_VOTES_PER_PROMPT) lets each agent vote on K requests per LLM call.
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get('requests')
+    if not isinstance(items, list) or not items:
+        return jsonify({
+            "success": False,
+            "error": "requests must be a non-empty list"
+        }), 400
+    if len(items) > MAX_BATCH_SIZE:
+        return jsonify({
+            "success": False,
+            "error": f"at most {MAX_BATCH_SIZE} requests per batch"
+        }), 400
+    votes_per_prompt = data.get('votes_per_prompt', 1)
+    if isinstance(votes_per_prompt, bool) or not isinstance(votes_per_prompt, int) or votes_per_prompt < 1:
+        return jsonify({
+            "success": False,
+            "error": "votes_per_prompt must be a positive integer"
+        }), 400
+    
+    try:
+        # Malformed items are passed through and reported as per-item errors
+        purchase_requests = [
+            _purchase_request_from(item) if isinstance(item, dict) else item
+            for item in items
+        ]
+        results = background_loop.run(consensus_system.evaluate_batch(
+            purchase_requests,
+            early_exit=bool(data.get('early_exit', False)),
+            max_concurrency=BATCH_CONCURRENCY,
+            votes_per_prompt=min(votes_per_prompt, MAX_VOTES_PER_PROMPT)
+        ))
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+    
+    for item in results:
+        if item['success']:
+            _store_decision(item['result'])
+    
+    succeeded = sum(1 for item in results if item['success'])
+    return jsonify({
+        "success": True,
+        "results": results,
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded
+    })
+
+@app.route('/api/evaluate/stream', methods=['GET', 'POST'])
+def evaluate_purchase_stream():
+    """
+    Server-Sent Events stream of an evaluation: one 'vote' event per agent as
+    it finishes, a 'tally' event after each vote, then the 'decision' event.
+    POST takes a JSON body; GET takes query args (for EventSource).
+    """
+    data = request.get_json(silent=True) if request.method == 'POST' else request.args
+    if not data:
+        return jsonify({
+            "success": False,
+            "error": "purchase request is required"
+        }), 400
+    
+    purchase_request = _purchase_request_from(data)
+    if request.method == 'GET':
+        for field in ('amount', 'budget_remaining'):
+            try:
+                purchase_request[field] = float(purchase_request[field])
+            except (TypeError, ValueError):
+                pass
+    
+    def generate():
+        try:
+            for event in background_loop.iterate(consensus_system.stream_evaluation(purchase_request)):
+                if event['event'] == 'decision':
+                    # Store in global state
+                    _store_decision(event['data'])
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+
 @app.route('/api/simulate', methods=['POST'])
 def simulate_agent():
     """
-    Endpoint to run an autonomous agent simulation
+    Endpoint to queue an autonomous agent simulation.
+    Returns a job ID right away; poll /api/jobs/<job_id> for progress.
     """
     if not SIMULATION_AVAILABLE:
         return jsonify({
@@ -80,52 +380,157 @@ def simulate_agent():
                 "error": "agent_name and goal are required"
             }), 400
         
-        # Create and run the autonomous agent
+        # Create the autonomous agent and queue it
         agent = AutonomousTaskAgent(
             agent_name=agent_name,
             goal=goal,
-            budget=budget
+            budget=budget,
+            consensus_system=consensus_system
         )
         
-        result = asyncio.run(agent.complete_task())
-        
-        # Store in global state
-        simulation_results.append(result)
+        try:
+            job = simulation_jobs.submit(
+                agent_name, goal, budget,
+                run=lambda job: agent.complete_task(on_action=job.actions_taken.append),
+                # Store in global state once finished
+                on_complete=_store_simulation
+            )
+        except JobQueueFull as e:
+            return jsonify({
+                "success": False,
+                "error": f"Simulation queue is full: {e}. Try again later."
+            }), 429
         
         return jsonify({
             "success": True,
-            "result": result
-        })
+            "job_id": job.job_id,
+            "status": job.status
+        }), 202
         
     except Exception as e:
-        print(f"Error in simulation: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        print(f"Error queueing simulation: {str(e)}")
         return jsonify({
             "success": False,
             "error": str(e)
         }), 500
 
-@app.route('/api/results', methods=['GET'])
-def get_results():
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """
+    List simulation jobs (without their results)
+    """
+    return jsonify({
+        "success": True,
+        "counts": simulation_jobs.stats(),
+        "jobs": [job.to_dict(include_result=False) for job in simulation_jobs.list()]
+    })
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
     """
-    Get all evaluation results
+    Status, partial actions_taken and final result of a simulation job
     """
+    job = simulation_jobs.get(job_id)
+    if job is None:
+        return jsonify({
+            "success": False,
+            "error": f"Unknown job: {job_id}"
+        }), 404
+    
     return jsonify({
         "success": True,
-        "results": latest_results
+        "job": job.to_dict()
     })
 
+@app.route('/api/results', methods=['GET'])
+def get_results():
+    """
+    Get evaluation results, newest first.
+    Supports ?limit=&offset= plus requesting_agent= and approved= filters,
+    ?since=<cursor> for new results only, and ?view=compact for smaller payloads.
+    """
+    return _listing('results', latest_results)
+
 @app.route('/api/simulations', methods=['GET'])
 def get_simulations():
     """
-    Get all simulation results
+    Get simulation results, newest first.
+    Supports ?limit=&offset= plus a requesting_agent= filter,
+    ?since=<cursor> for new simulations only, and ?view=compact for smaller payloads.
+    """
+    return _listing('simulations', simulation_results)
+
+@app.route('/api/providers', methods=['GET'])
+def get_provider_health():
+    """
+    Circuit breaker state per provider (closed/open/half_open), with
+    success/failure/rejection counts and the last error
     """
     return jsonify({
         "success": True,
-        "simulations": simulation_results
+        "providers": provider_health.stats()
     })
 
+@app.route('/api/scheduler', methods=['GET'])
+def get_scheduler_stats():
+    """
+    Admission scheduler state per provider: limits, calls in flight and
+    queued calls by urgency
+    """
+    return jsonify({
+        "success": True,
+        "scheduler": admission_scheduler.stats() if admission_scheduler is not None else None
+    })
+
+@app.route('/api/routing', methods=['GET'])
+def get_routing_stats():
+    """
+    Adaptive routing history: per agent and request bucket, agreement with
+    the outcome, mean latency and estimated tokens
+    """
+    return jsonify({
+        "success": True,
+        "routing": agent_router.stats() if agent_router is not None else None
+    })
+
+@app.route('/api/cache', methods=['GET'])
+def get_cache_stats():
+    """
+    Decision cache and near-duplicate index hit/miss counters
+    """
+    return jsonify({
+        "success": True,
+        "cache": decision_cache.stats() if decision_cache is not None else None,
+        "similarity": similarity_index.stats() if similarity_index is not None else None
+    })
+
+# Gauges refreshed from the other subsystems on every scrape
+_cache_gauge = REGISTRY.gauge('quorum_decision_cache', 'Decision cache counters', ('stat',))
+_jobs_gauge = REGISTRY.gauge('quorum_simulation_jobs', 'Simulation jobs by status', ('status',))
+_stored_gauge = REGISTRY.gauge('quorum_stored_results', 'Stored results by kind', ('kind',))
+_circuit_gauge = REGISTRY.gauge(
+    'quorum_circuit_open', 'Provider circuit state (0 closed, 0.5 half open, 1 open)', ('provider',)
+)
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Prometheus metrics: per-agent latency histograms, vote/abstain/timeout
+    counts, parse failures, estimated tokens and decision latency
+    """
+    if decision_cache is not None:
+        stats = decision_cache.stats()
+        for stat in ('hits', 'misses', 'evictions', 'entries'):
+            _cache_gauge.set(stats[stat], stat=stat)
+    for status, count in simulation_jobs.stats().items():
+        _jobs_gauge.set(count, status=status)
+    for provider, state in provider_health.stats().items():
+        _circuit_gauge.set({'closed': 0, 'half_open': 0.5, 'open': 1}[state['state']], provider=provider)
+    _stored_gauge.set(len(latest_results), kind='decisions')
+    _stored_gauge.set(len(simulation_results), kind='simulations')
+    
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """
@@ -137,4 +542,6 @@ def health_check():
     })
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5001)
\ No newline at end of file
+    # Threaded server: request threads only wait while the shared event loop
+    # runs all evaluations concurrently
+    app.run(debug=True, port=5001, threaded=True)
\ No newline at end of file
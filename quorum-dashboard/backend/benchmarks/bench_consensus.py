@@ -0,0 +1,268 @@
+"""
+Offline load test for the consensus system, using the simulated Dedalus
+backend in fake_dedalus.py (no provider calls, no API keys needed).
+
+Measures decisions/sec, p50/p95/p99 latency and peak traced memory at several
+concurrency levels for:
+  direct      AgentConsensusSystem.evaluate_purchase
+  http        POST /api/evaluate through the Flask app
+  simulation  AutonomousTaskAgent.complete_task
+
+Usage (from quorum-dashboard/backend):
+  python benchmarks/bench_consensus.py --concurrency 1,10,50 --requests 200 \\
+      --latency-scale 0.01 --output bench.json
+  python benchmarks/bench_consensus.py --baseline bench.json   # exit 1 on regression
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Benchmark the quorum itself: no result history, cache or policy shortcuts
+os.environ.setdefault('QUORUM_RESULTS_DB', 'none')
+os.environ.setdefault('QUORUM_CACHE', 'none')
+os.environ.setdefault('QUORUM_POLICY_PATH', 'none')
+
+from concensus import AgentConsensusSystem
+from fake_dedalus import FakeDedalus, FakeDedalusRunner
+from provider_health import ProviderHealth, provider_health
+from scheduler import AdmissionScheduler, admission_scheduler
+from payments_sim import AutonomousTaskAgent
+
+
+def make_request(i: int) -> dict:
+    # Distinct amounts so no two requests share a cache key
+    return {
+        "amount": 100 + i,
+        "purpose": "Benchmark purchase",
+        "requesting_agent": "Benchmark Agent",
+        "justification": "Load test",
+        "expected_roi": "None",
+        "urgency": "Medium",
+        "budget_remaining": 1000000
+    }
+
+
+def percentile(values, p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(mode: str, concurrency: int, latencies, errors: int, elapsed: float, peak: int) -> dict:
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_s": round(len(latencies) / elapsed, 2) if elapsed else 0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "mean": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0,
+            "max": round(max(latencies) * 1000, 2) if latencies else 0
+        },
+        "peak_traced_mb": round(peak / 1024 / 1024, 2)
+    }
+
+
+async def _run_concurrently(call, concurrency: int, count: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await call(i)
+                latencies.append(time.perf_counter() - started)
+            except Exception:
+                errors += 1
+
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return latencies, errors
+
+
+def bench_direct(system: AgentConsensusSystem, concurrency: int, count: int, early_exit: bool):
+    return asyncio.run(_run_concurrently(
+        lambda i: system.evaluate_purchase(make_request(i), early_exit=early_exit), concurrency, count
+    ))
+
+
+def bench_simulation(system: AgentConsensusSystem, concurrency: int, count: int, early_exit: bool):
+    async def simulate(i: int):
+        agent = AutonomousTaskAgent(f"Benchmark Agent {i}", "Benchmark goal", 5000, consensus_system=system)
+        await agent.complete_task()
+
+    return asyncio.run(_run_concurrently(simulate, concurrency, count))
+
+
+def bench_http(system: AgentConsensusSystem, concurrency: int, count: int, early_exit: bool):
+    import api
+
+    api.consensus_system = system
+    local = threading.local()
+
+    def post(i: int):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = api.app.test_client()
+        started = time.perf_counter()
+        body = dict(make_request(i), early_exit=early_exit)
+        response = client.post('/api/evaluate', json=body)
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        return time.perf_counter() - started
+
+    latencies, errors = [], 0
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(post, i) for i in range(count)]:
+            try:
+                latencies.append(future.result())
+            except Exception:
+                errors += 1
+    return latencies, errors
+
+
+def fresh_health(latency_scale: float) -> ProviderHealth:
+    """
+    Breakers and retry policy for one run, configured like the process-wide
+    ones but with backoff and reset times scaled like the simulated latencies.
+    Runs never inherit each other's open circuits.
+    """
+    return ProviderHealth(
+        failure_threshold=provider_health.failure_threshold,
+        reset_timeout=provider_health.reset_timeout * latency_scale,
+        max_retries=provider_health.max_retries,
+        base_delay=provider_health.base_delay * latency_scale,
+        max_delay=provider_health.max_delay * latency_scale
+    )
+
+
+def fresh_scheduler():
+    """
+    An empty admission scheduler for one run, with the configured limits
+    (None when QUORUM_SCHEDULER=off).
+    """
+    if admission_scheduler is None:
+        return None
+    limits = dict(admission_scheduler.limits, **{'*': admission_scheduler.default_limit})
+    return AdmissionScheduler(limits=limits, aging=admission_scheduler.aging)
+
+
+MODES = {
+    "direct": bench_direct,
+    "http": bench_http,
+    "simulation": bench_simulation,
+}
+
+
+def compare(results: list, baseline: dict, tolerance: float) -> list:
+    """
+    Regressions versus a previous run: throughput down or p95 up by more than tolerance.
+    """
+    previous = {(r['mode'], r['concurrency']): r for r in baseline.get('results', [])}
+    regressions = []
+    for result in results:
+        base = previous.get((result['mode'], result['concurrency']))
+        if base is None:
+            continue
+        if result['throughput_per_s'] < base['throughput_per_s'] * (1 - tolerance):
+            regressions.append(f"{result['mode']}@{result['concurrency']}: throughput "
+                               f"{base['throughput_per_s']} -> {result['throughput_per_s']}/s")
+        if result['latency_ms']['p95'] > base['latency_ms']['p95'] * (1 + tolerance):
+            regressions.append(f"{result['mode']}@{result['concurrency']}: p95 "
+                               f"{base['latency_ms']['p95']} -> {result['latency_ms']['p95']} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', default='direct,http,simulation')
+    parser.add_argument('--concurrency', default='1,10,50', help='comma-separated concurrency levels')
+    parser.add_argument('--requests', type=int, default=100, help='decisions (or simulations) per level')
+    parser.add_argument('--latency-scale', type=float, default=0.01, help='multiplier for simulated latencies')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='default simulated provider error rate')
+    parser.add_argument('--profile', help='JSON file with per-model latency/error/output profiles')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--early-exit', action='store_true')
+    parser.add_argument('--output', help='write JSON results here (default: stdout)')
+    parser.add_argument('--baseline', help='previous JSON results to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed relative regression')
+    args = parser.parse_args()
+
+    profiles = None
+    if args.profile:
+        with open(args.profile) as f:
+            profiles = json.load(f)
+
+    results = []
+    for mode in args.modes.split(','):
+        for concurrency in [int(c) for c in args.concurrency.split(',')]:
+            runner = FakeDedalusRunner(profiles, latency_scale=args.latency_scale,
+                                       error_rate=args.error_rate, seed=args.seed)
+            system = AgentConsensusSystem(client=FakeDedalus(), runner=runner,
+                                          health=fresh_health(args.latency_scale),
+                                          scheduler=fresh_scheduler())
+            count = max(1, args.requests // 10) if mode == 'simulation' else args.requests
+
+            tracemalloc.start()
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                latencies, errors = MODES[mode](system, concurrency, count, args.early_exit)
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            result = summarize(mode, concurrency, latencies, errors, elapsed, peak)
+            result["provider_calls"] = runner.calls
+            results.append(result)
+            print(f"{mode:>10} @ {concurrency:<4} {result['throughput_per_s']:>9}/s  "
+                  f"p50 {result['latency_ms']['p50']:>9} ms  p95 {result['latency_ms']['p95']:>9} ms  "
+                  f"p99 {result['latency_ms']['p99']:>9} ms  errors {errors}", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "requests": args.requests,
+            "latency_scale": args.latency_scale,
+            "error_rate": args.error_rate,
+            "early_exit": args.early_exit,
+            "seed": args.seed
+        },
+        "results": results
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
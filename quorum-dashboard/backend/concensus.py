@@ -1,20 +1,119 @@
 import asyncio
+import contextlib
+import copy
 from dotenv import load_dotenv
 from dedalus_labs import AsyncDedalus, DedalusRunner
 from dedalus_labs import * 
 from typing import List, Dict
+import inspect
 import json
+import os
+import time
+import uuid
+from decision_cache import make_cache_key
+from dedalus_pool import get_client, get_runner, close_client
+from policy import ESCALATE
+from provider_health import CircuitOpenError, is_transient, provider_health, provider_of
+from scheduler import URGENCY_RANK, admission_scheduler, urgency_of
+from metrics import (AGENT_LATENCY, AGENT_VOTES, AGENTS_SKIPPED, COALESCED, DECISION_LATENCY, DECISIONS,
+                     MODEL_CALLS, PARSE_FAILURES, TOKENS, estimate_tokens)
+from vote_parser import IncrementalVoteParser, _risk, extract_json_array, normalize_vote, parse_vote_response
 
 load_dotenv()
 
+# Latency bounds in seconds, overridable through the environment.
+# AGENT_TIMEOUT caps a single agent, DECISION_TIMEOUT caps the whole quorum
+# and HEDGE_AFTER is when a slow primary model gets raced against its fallback.
+AGENT_TIMEOUT = float(os.getenv('QUORUM_AGENT_TIMEOUT', '45'))
+DECISION_TIMEOUT = float(os.getenv('QUORUM_DECISION_TIMEOUT', '60'))
+HEDGE_AFTER = float(os.getenv('QUORUM_HEDGE_AFTER', '15'))
+
+# Early exit: 'on' lets the votes that were not awaited finish in the
+# background and records them as the decision's late_votes
+FINISH_IN_BACKGROUND = os.getenv('QUORUM_FINISH_IN_BACKGROUND', 'off').lower() == 'on'
+
+# Vote streaming: 'off' waits for the full answer, 'full' streams it, and
+# 'vote_only' stops the stream as soon as the vote and risk score are known
+STREAM_VOTES = os.getenv('QUORUM_STREAM_VOTES', 'off')
+
+def _chunk_text(chunk) -> str:
+    """
+    Text delta of a streamed chat completion chunk (object or dict form).
+    """
+    choices = chunk.get('choices') if isinstance(chunk, dict) else getattr(chunk, 'choices', None)
+    if not choices:
+        return ''
+    choice = choices[0]
+    delta = choice.get('delta') if isinstance(choice, dict) else getattr(choice, 'delta', None)
+    if delta is None:
+        return ''
+    content = delta.get('content') if isinstance(delta, dict) else getattr(delta, 'content', None)
+    return content or ''
+
+
 class AgentConsensusSystem:
     """
     Multi-agent consensus system for evaluating spending requests.
     5 agents with different roles vote on whether to approve purchases.
     """
     
-    def __init__(self):
-        self.client = AsyncDedalus()
+    def __init__(self, early_exit: bool = False, finish_in_background: bool = FINISH_IN_BACKGROUND,
+                 agent_timeout: float = AGENT_TIMEOUT, decision_timeout: float = DECISION_TIMEOUT,
+                 hedge_after: float = HEDGE_AFTER, cache=None, client: AsyncDedalus = None,
+                 policy=None, stream_votes: str = STREAM_VOTES, runner: DedalusRunner = None,
+                 router=None, similarity_index=None, coalesce: bool = True, health=None,
+                 tiers=None, scheduler=None, on_late_votes=None):
+        # Uses the process-wide pooled client unless a client (or a runner,
+        # e.g. fake_dedalus.FakeDedalusRunner for offline benchmarks) is injected
+        self._client = client
+        self._runner = runner
+
+        # Optional decision cache (see decision_cache.py) and near-duplicate
+        # index that reuses decisions on reworded requests (see similarity_index.py)
+        self.cache = cache
+        self.similarity_index = similarity_index
+
+        # Optional deterministic pre-screen run before the quorum (see policy.py)
+        self.policy = policy
+
+        # Optional adaptive routing that defers predictable agents (see agent_router.py)
+        self.router = router
+
+        if stream_votes not in ('off', 'full', 'vote_only'):
+            raise ValueError(f"stream_votes must be 'off', 'full' or 'vote_only', not {stream_votes!r}")
+        self.stream_votes = stream_votes
+
+        # Per-provider retries and circuit breakers (see provider_health.py),
+        # shared process-wide unless injected
+        self.health = health if health is not None else provider_health
+
+        # Urgency-ordered admission under per-provider concurrency and rate
+        # limits (see scheduler.py), shared process-wide unless injected
+        self.scheduler = scheduler if scheduler is not None else admission_scheduler
+
+        # Deadlines (None disables them). Agents with a fallback_model get the
+        # same prompt sent to it once the primary misses hedge_after.
+        self.agent_timeout = agent_timeout
+        self.decision_timeout = decision_timeout
+        self.hedge_after = hedge_after
+
+        # Majority rule: a purchase needs this many YES votes to be approved
+        self.approval_threshold = 3
+
+        # Early exit returns as soon as the outcome can no longer change.
+        # Leftover votes are cancelled, or kept running for the audit trail:
+        # on_late_votes(decision_id, late_votes) is called once they are all in,
+        # so whoever stored the decision can update it.
+        self.early_exit = early_exit
+        self.finish_in_background = finish_in_background
+        self.on_late_votes = on_late_votes
+        self._background_tasks = set()
+        self._late_votes_pending = set()  # decision ids still waiting on late votes
+
+        # Single flight: identical concurrent evaluations share one quorum round
+        self.coalesce = coalesce
+        self._in_flight = {}
+        self._streams_in_flight = {}
         
         # Define 5 agents with different roles and optimal models
         self.agents = [
@@ -22,6 +121,7 @@ class AgentConsensusSystem:
                 "name": "CFO Agent",
                 "role": "Conservative financial oversight",
                 "model": "anthropic/claude-sonnet-4-20250514",  # Best for careful analysis
+                "fallback_model": "anthropic/claude-3-5-haiku-20241022",
                 "persona": "You are a conservative CFO focused on cost control and ROI. You scrutinize every expense and require clear business justification. You vote YES only when the ROI is crystal clear.",
                 "emoji": "💼"
             },
@@ -50,152 +150,589 @@ class AgentConsensusSystem:
                 "name": "Data Agent",
                 "role": "Evidence-based decision making",
                 "model": "openai/o1",  # Best for analytical reasoning
+                "fallback_model": "openai/gpt-4o-mini",
                 "persona": "You are a data scientist who makes decisions based purely on metrics and evidence. You vote YES only when data supports the decision.",
                 "emoji": "📊"
             }
         ]
+
+        # Optional cost tiers: cheap agents first, the rest only on split votes
+        # (see escalation.py). Checked against the roster up front.
+        self.tiers = tiers
+        if tiers is not None:
+            tiers.plan(self.agents)
     
-    async def get_agent_vote(self, agent: Dict, purchase_request: Dict) -> Dict:
-        """
-        Get a single agent's vote on a purchase request.
-        """
-        runner = DedalusRunner(self.client)
-        
-        # Format the purchase request for the agent
-        request_context = f"""
-PURCHASE REQUEST:
-Amount: ${purchase_request['amount']}
+    @property
+    def client(self) -> AsyncDedalus:
+        return self._client if self._client is not None else get_client()
+
+    @property
+    def runner(self) -> DedalusRunner:
+        if self._runner is not None:
+            return self._runner
+        if self._client is None:
+            return get_runner()
+        self._runner = DedalusRunner(self._client)
+        return self._runner
+
+    def _format_request(self, purchase_request: Dict) -> str:
+        return f"""Amount: ${purchase_request['amount']}
 Purpose: {purchase_request['purpose']}
 Requesting Agent: {purchase_request['requesting_agent']}
 Justification: {purchase_request['justification']}
 Expected ROI: {purchase_request.get('expected_roi', 'Not specified')}
 Urgency: {purchase_request.get('urgency', 'Medium')}
-Current Budget Remaining: ${purchase_request.get('budget_remaining', 'Unknown')}
+Current Budget Remaining: ${purchase_request.get('budget_remaining', 'Unknown')}"""
+
+    def _build_prompt(self, agent: Dict, purchase_request: Dict) -> str:
+        """
+        Format the purchase request for the agent.
+        """
+        return f"""
+PURCHASE REQUEST:
+{self._format_request(purchase_request)}
 
 YOUR ROLE: {agent['role']}
 YOUR PERSONA: {agent['persona']}
 
 Analyze this purchase request and provide:
 1. Your vote (YES or NO)
-2. Your reasoning (2-3 sentences)
-3. A risk score from 1-10 (1 = very safe, 10 = very risky)
+2. A risk score from 1-10 (1 = very safe, 10 = very risky)
+3. Your reasoning (2-3 sentences)
 4. Any conditions for approval
 
-Format your response as JSON:
+Format your response as JSON, with the fields in this order:
 {{
     "vote": "YES" or "NO",
-    "reasoning": "your detailed reasoning here",
     "risk_score": 5,
+    "reasoning": "your detailed reasoning here",
     "conditions": "any conditions or empty string"
 }}
 """
-        
+
+    def _build_batch_prompt(self, agent: Dict, purchase_requests: Dict) -> str:
+        """
+        Format several purchase requests (request ID -> request) into one
+        prompt, so the persona is sent once and the agent votes on all of them.
+        """
+        requests_text = "\n\n".join(
+            f"REQUEST ID: {request_id}\n{self._format_request(purchase_request)}"
+            for request_id, purchase_request in purchase_requests.items()
+        )
+        return f"""
+YOUR ROLE: {agent['role']}
+YOUR PERSONA: {agent['persona']}
+
+You will review {len(purchase_requests)} PURCHASE REQUESTS. Judge each one on its own merits.
+
+{requests_text}
+
+For EACH request provide:
+1. Your vote (YES or NO)
+2. Your reasoning (2-3 sentences)
+3. A risk score from 1-10 (1 = very safe, 10 = very risky)
+4. Any conditions for approval
+
+Format your response as a JSON array with one object per request ID:
+[
+    {{
+        "request_id": "R1",
+        "vote": "YES" or "NO",
+        "reasoning": "your detailed reasoning here",
+        "risk_score": 5,
+        "conditions": "any conditions or empty string"
+    }}
+]
+"""
+
+    def _admit(self, model: str, urgency: str):
+        if self.scheduler is None:
+            return contextlib.nullcontext()
+        return self.scheduler.slot(model, urgency)
+
+    async def _run_model(self, model: str, prompt: str, vote_only: bool = False, urgency: str = None,
+                         admitted: asyncio.Event = None) -> str:
+        """
+        Call the model once admitted by the scheduler (admitted, if given, is
+        set then), retrying transient failures with exponential backoff.
+        The circuit breaker is only asked once admitted, so a queued call never
+        holds a half-open provider's trial slot. Raises CircuitOpenError
+        without calling when the provider's circuit is open.
+        """
+        TOKENS.inc(estimate_tokens(prompt), model=model, direction='in')
+        attempt = 0
+        while True:
+            permitted = False
+            try:
+                async with self._admit(model, urgency):
+                    if admitted is not None:
+                        admitted.set()
+                    if not self.health.allow(model):
+                        MODEL_CALLS.inc(model=model, outcome='circuit_open')
+                        raise CircuitOpenError(provider_of(model))
+                    permitted = True
+                    if self.stream_votes == 'off':
+                        response = await self.runner.run(
+                            input=prompt,
+                            model=model
+                        )
+                        output = response.final_output
+                    else:
+                        output = await self._stream_model(model, prompt, vote_only and self.stream_votes == 'vote_only')
+            except asyncio.CancelledError:
+                if permitted:
+                    self.health.release(model)
+                MODEL_CALLS.inc(model=model, outcome='cancelled')
+                raise
+            except Exception as e:
+                if not permitted:
+                    raise
+                MODEL_CALLS.inc(model=model, outcome='error')
+                if not is_transient(e):
+                    self.health.release(model)
+                    raise
+                self.health.record_failure(model, e)
+                if attempt >= self.health.max_retries:
+                    raise
+                delay = self.health.backoff(attempt)
+                attempt += 1
+                print(f"🔁 {model} failed ({type(e).__name__}), retry {attempt}/{self.health.max_retries} "
+                      f"in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            self.health.record_success(model)
+            MODEL_CALLS.inc(model=model, outcome='ok')
+            TOKENS.inc(estimate_tokens(output), model=model, direction='out')
+            return output
+
+    async def _stream_model(self, model: str, prompt: str, vote_only: bool) -> str:
+        """
+        Stream the model's answer. With vote_only, closing the stream as soon as
+        the vote and risk score have arrived stops generating the reasoning.
+        """
+        stream = self.runner.run(
+            input=prompt,
+            model=model,
+            stream=True
+        )
+        if inspect.isawaitable(stream):
+            stream = await stream
+
+        parser = IncrementalVoteParser()
+        try:
+            async for chunk in stream:
+                text = _chunk_text(chunk)
+                if text:
+                    parser.feed(text)
+                if vote_only and parser.has_vote_and_risk:
+                    break
+        finally:
+            aclose = getattr(stream, 'aclose', None)
+            if aclose is not None:
+                await aclose()
+        return parser.text
+
+    async def _run_with_hedge(self, agent: Dict, prompt: str, vote_only: bool = False, urgency: str = None):
+        """
+        Run the agent's primary model under the per-agent deadline. If it has not
+        answered after hedge_after seconds and the agent has a fallback_model, the
+        same prompt is sent to the fallback and the first answer wins. Both
+        clocks start once the scheduler admits the primary: waiting in the
+        provider's queue is not slowness a hedge could fix (the decision
+        deadline still bounds it). When the primary provider's circuit is open
+        the fallback is used straight away.
+        Returns (output, source, model) where source is 'primary', 'hedge' or
+        'fallback'; raises CircuitOpenError when no model can be called.
+        """
+        model, source = agent['model'], 'primary'
+        fallback_model = agent.get('fallback_model')
+        if not self.health.available(model):
+            self.health.record_rejection(model)
+            if not fallback_model or not self.health.available(fallback_model):
+                raise CircuitOpenError(provider_of(model))
+            print(f"🚧 {provider_of(model)} circuit open, {agent['name']} using {fallback_model}")
+            model, source, fallback_model = fallback_model, 'fallback', None
+
+        admitted = asyncio.Event()
+        primary = asyncio.ensure_future(self._run_model(model, prompt, vote_only, urgency, admitted))
+        racers = {primary: (source, model)}
+        loop = asyncio.get_running_loop()
+
         try:
-            response = await runner.run(
-                input=request_context,
-                model=agent['model']
+            admission = asyncio.ensure_future(admitted.wait())
+            try:
+                await asyncio.wait({primary, admission}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                admission.cancel()
+            deadline = loop.time() + self.agent_timeout if self.agent_timeout else None
+
+            if fallback_model and self.hedge_after is not None:
+                hedge_wait = self.hedge_after
+                if deadline is not None:
+                    hedge_wait = min(hedge_wait, self.agent_timeout)
+                done, _ = await asyncio.wait({primary}, timeout=hedge_wait)
+                if (not done and (deadline is None or loop.time() < deadline)
+                        and self.health.available(fallback_model)):
+                    print(f"⏱️  {agent['name']} is slow, hedging with {fallback_model}")
+                    hedge = asyncio.ensure_future(self._run_model(fallback_model, prompt, vote_only, urgency))
+                    racers[hedge] = ('hedge', fallback_model)
+
+            pending = set(racers)
+            while pending:
+                timeout = None if deadline is None else max(0, deadline - loop.time())
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    raise asyncio.TimeoutError()
+                for task in done:
+                    # A failed racer only loses if the other one is still running
+                    if task.exception() is None or not pending:
+                        source, model = racers[task]
+                        return task.result(), source, model
+        finally:
+            for task in racers:
+                if not task.done():
+                    task.cancel()
+
+    def _abstain_vote(self, agent: Dict, reasoning: str, source: str) -> Dict:
+        return {
+            "agent_name": agent['name'],
+            "emoji": agent['emoji'],
+            "vote": "ABSTAIN",
+            "reasoning": reasoning,
+            "risk_score": 0,
+            "conditions": "",
+            "model": agent['model'],
+            "source": source
+        }
+
+    async def get_agent_vote(self, agent: Dict, purchase_request: Dict) -> Dict:
+        """
+        Get a single agent's vote on a purchase request.
+        The vote's 'source' records whether the answer came from the primary
+        model, the hedge or fallback model, or is a timeout/error/circuit_open abstain.
+        """
+        request_context = self._build_prompt(agent, purchase_request)
+        started = time.perf_counter()
+
+        try:
+            output, source, model = await self._run_with_hedge(
+                agent, request_context, vote_only=True, urgency=purchase_request.get('urgency')
             )
-            
+
             # Parse the response
-            result = self._parse_agent_response(response.final_output, agent)
-            return result
-            
+            result = self._parse_agent_response(output, agent)
+            result['model'] = model
+            result['source'] = source
+
+        except asyncio.TimeoutError:
+            print(f"Timeout getting vote from {agent['name']} after {self.agent_timeout}s")
+            result = self._abstain_vote(
+                agent, f"No response within {self.agent_timeout}s", source="timeout"
+            )
+
+        except CircuitOpenError as e:
+            result = self._abstain_vote(agent, f"{e}, not waiting on it", source="circuit_open")
+
         except Exception as e:
             print(f"Error getting vote from {agent['name']}: {e}")
-            return {
+            result = self._abstain_vote(agent, f"Error occurred: {str(e)}", source="error")
+
+        return self._record_vote(result, started)
+
+    def _record_vote(self, vote: Dict, started: float) -> Dict:
+        """
+        Stamp the vote with its latency and update the vote metrics.
+        """
+        elapsed = time.perf_counter() - started
+        vote['latency_ms'] = round(elapsed * 1000, 1)
+        AGENT_LATENCY.observe(elapsed, agent=vote['agent_name'], model=vote['model'], source=vote['source'])
+        AGENT_VOTES.inc(agent=vote['agent_name'], vote=vote['vote'], source=vote['source'])
+        return vote
+
+    async def get_agent_votes_batch(self, agent: Dict, purchase_requests: List[Dict]) -> List[Dict]:
+        """
+        Get one agent's votes on several purchase requests with a single LLM call.
+        Requests whose vote is missing or unparseable in the returned array (or
+        all of them, if the call fails) fall back to one get_agent_vote each.
+        Returns the votes in the order of purchase_requests.
+        """
+        request_ids = [f"R{i + 1}" for i in range(len(purchase_requests))]
+        prompt = self._build_batch_prompt(agent, dict(zip(request_ids, purchase_requests)))
+
+        votes = {}
+        started = time.perf_counter()
+        try:
+            # The shared call is admitted at its most urgent request's priority
+            urgency = min((urgency_of(request.get('urgency')) for request in purchase_requests),
+                          key=URGENCY_RANK.get)
+            output, source, model = await self._run_with_hedge(agent, prompt, urgency=urgency)
+            votes = self._parse_agent_batch_response(output, agent, request_ids)
+            for vote in votes.values():
+                vote['model'] = model
+                vote['source'] = source
+                self._record_vote(vote, started)
+            if len(votes) < len(request_ids):
+                PARSE_FAILURES.inc(len(request_ids) - len(votes), agent=agent['name'], model=model)
+        except Exception as e:
+            print(f"Error getting batched votes from {agent['name']}: {e!r}")
+
+        missing = [i for i, request_id in enumerate(request_ids) if request_id not in votes]
+        if missing:
+            print(f"↩️  {agent['name']}: {len(missing)} of {len(request_ids)} batched vote(s) "
+                  f"missing, asking one by one")
+            fallback_votes = await asyncio.gather(
+                *(self.get_agent_vote(agent, purchase_requests[i]) for i in missing)
+            )
+            for i, vote in zip(missing, fallback_votes):
+                votes[request_ids[i]] = vote
+
+        return [votes[request_id] for request_id in request_ids]
+
+    def _parse_agent_batch_response(self, response: str, agent: Dict, request_ids: List[str]) -> Dict:
+        """
+        Parse a JSON array of votes keyed by request_id. Only well-formed YES/NO
+        votes for known request IDs are returned (request ID -> vote); the
+        other fields are normalized like parse_vote_response does.
+        """
+        votes = {}
+        for item in extract_json_array(response or '') or []:
+            request_id = str(item.get('request_id', ''))
+            vote = normalize_vote(item.get('vote'))
+            if request_id not in request_ids or vote is None:
+                continue
+            risk = _risk(item.get('risk_score'))
+            votes[request_id] = {
                 "agent_name": agent['name'],
                 "emoji": agent['emoji'],
-                "vote": "ABSTAIN",
-                "reasoning": f"Error occurred: {str(e)}",
-                "risk_score": 0,
-                "conditions": "",
+                "vote": vote,
+                "reasoning": item.get('reasoning') or 'No reasoning provided',
+                "risk_score": risk if risk is not None else 5,
+                "conditions": item.get('conditions') or '',
                 "model": agent['model']
             }
-    
+        return votes
+
     def _parse_agent_response(self, response: str, agent: Dict) -> Dict:
         """
         Parse agent response and extract structured data.
+        Answers without an unambiguous YES/NO vote are recorded as ABSTAIN.
         """
-        try:
-            # Try to find JSON in the response
-            start = response.find('{')
-            end = response.rfind('}') + 1
-            
-            if start != -1 and end > start:
-                json_str = response[start:end]
-                parsed = json.loads(json_str)
-                
-                return {
-                    "agent_name": agent['name'],
-                    "emoji": agent['emoji'],
-                    "vote": parsed.get('vote', 'ABSTAIN'),
-                    "reasoning": parsed.get('reasoning', 'No reasoning provided'),
-                    "risk_score": parsed.get('risk_score', 5),
-                    "conditions": parsed.get('conditions', ''),
-                    "model": agent['model']
-                }
-            else:
-                # Fallback parsing
-                vote = "YES" if "YES" in response.upper() else "NO" if "NO" in response.upper() else "ABSTAIN"
-                return {
-                    "agent_name": agent['name'],
-                    "emoji": agent['emoji'],
-                    "vote": vote,
-                    "reasoning": response[:200],
-                    "risk_score": 5,
-                    "conditions": "",
-                    "model": agent['model']
-                }
-                
-        except Exception as e:
+        parsed = parse_vote_response(response)
+        if parsed is None:
+            PARSE_FAILURES.inc(agent=agent['name'], model=agent['model'])
             return {
                 "agent_name": agent['name'],
                 "emoji": agent['emoji'],
                 "vote": "ABSTAIN",
-                "reasoning": response[:200],
+                "reasoning": (response or '')[:200],
                 "risk_score": 5,
                 "conditions": "",
                 "model": agent['model']
             }
-    
-    async def evaluate_purchase(self, purchase_request: Dict) -> Dict:
+
+        return {
+            "agent_name": agent['name'],
+            "emoji": agent['emoji'],
+            "vote": parsed['vote'],
+            "reasoning": parsed['reasoning'] or 'No reasoning provided',
+            "risk_score": parsed['risk_score'] if parsed['risk_score'] is not None else 5,
+            "conditions": parsed['conditions'] or '',
+            "model": agent['model']
+        }
+
+    def _is_decided(self, agent_votes: List[Dict], pending_count: int) -> bool:
         """
-        Main function: Get all 5 agents to vote on a purchase request.
-        Returns consensus decision and all agent votes.
+        True once the remaining votes can no longer change the outcome.
+        """
+        yes_votes = sum(1 for v in agent_votes if v['vote'] == 'YES')
+        return (yes_votes >= self.approval_threshold
+                or yes_votes + pending_count < self.approval_threshold)
+
+    async def _collect_votes(self, purchase_request: Dict, early_exit: bool, deferred: Dict = None,
+                             agents: List[Dict] = None, deadline: float = None):
+        """
+        Collect votes from agents (default: the whole roster) as they complete,
+        under the decision deadline (deadline is a loop time, when shared).
+        With early_exit, stops once the quorum is settled. Agents still running
+        at the decision deadline are cancelled and recorded as timeout abstains.
+        Deferred agents (name -> reason, see agent_router.py) are only asked
+        once the other agents have voted and left the outcome open; otherwise
+        they are skipped.
+        Returns the votes (in roster order), the still-running tasks, the
+        task -> agent mapping and the skipped agents (name -> reason).
+        """
+        deferred = deferred or {}
+        agents = self.agents if agents is None else agents
+        waiting = [agent for agent in agents if agent['name'] in deferred]
+        tasks = {
+            asyncio.ensure_future(self.get_agent_vote(agent, purchase_request)): agent
+            for agent in agents if agent['name'] not in deferred
+        }
+        loop = asyncio.get_running_loop()
+        if deadline is None and self.decision_timeout:
+            deadline = loop.time() + self.decision_timeout
+        started = time.perf_counter()
+
+        finished = {}
+        skipped = {}
+        pending = set(tasks)
+        while pending or waiting:
+            if self._is_decided(list(finished.values()), len(pending) + len(waiting)):
+                # Deferred agents could not change the outcome: never ask them
+                skipped.update((agent['name'], deferred[agent['name']]) for agent in waiting)
+                waiting = []
+                if early_exit or not pending:
+                    break
+            if not pending:
+                print(f"🔀 Outcome still open, asking deferred agent(s): "
+                      f"{', '.join(agent['name'] for agent in waiting)}")
+                for agent in waiting:
+                    task = asyncio.ensure_future(self.get_agent_vote(agent, purchase_request))
+                    tasks[task] = agent
+                    pending.add(task)
+                waiting = []
+            timeout = None if deadline is None else max(0, deadline - loop.time())
+            try:
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+            except asyncio.CancelledError:
+                # The evaluation itself was cancelled: stop every agent with it
+                for task in tasks:
+                    task.cancel()
+                raise
+            if not done:
+                print(f"⏱️  Decision deadline of {self.decision_timeout}s reached")
+                for task in pending:
+                    task.cancel()
+                    finished[task] = self._record_vote(self._abstain_vote(
+                        tasks[task], f"No response within decision deadline of {self.decision_timeout}s",
+                        source="timeout"
+                    ), started)
+                pending = set()
+                skipped.update((agent['name'], deferred[agent['name']]) for agent in waiting)
+                waiting = []
+                break
+            for task in done:
+                finished[task] = task.result()
+
+        votes_by_agent = {tasks[task]['name']: vote for task, vote in finished.items()}
+        agent_votes = [votes_by_agent[agent['name']] for agent in self.agents if agent['name'] in votes_by_agent]
+        return agent_votes, [task for task in tasks if task in pending], tasks, skipped
+
+    async def _collect_tiered_votes(self, purchase_request: Dict):
+        """
+        Ask the agents tier by tier (see escalation.py) under one decision
+        deadline. Stops after a tier whose votes agree strongly enough, or once
+        the quorum rule is settled - unless the votes so far are unanimous but
+        fail the risk thresholds, which always escalates. Returns the votes
+        (roster order), the tiers
+        that ran, the agents never asked (name -> reason) and the tier outcome
+        (True/False, or None when the quorum rule decides).
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.decision_timeout if self.decision_timeout else None
+        plan = self.tiers.plan(self.agents)
+        votes, tiers_run = {}, []
+        for index, (tier_name, tier_agents) in enumerate(plan):
+            tiers_run.append(tier_name)
+            tier_votes, _, _, _ = await self._collect_votes(
+                purchase_request, False, agents=tier_agents, deadline=deadline
+            )
+            votes.update((vote['agent_name'], vote) for vote in tier_votes)
+            cast = [votes[agent['name']] for agent in self.agents if agent['name'] in votes]
+            later = [agent for _, agents in plan[index + 1:] for agent in agents]
+            if not later:
+                return cast, tiers_run, {}, None
+            outcome = self.tiers.settle(cast)
+            # Agreement with too much (or too little) risk goes to the next tier even
+            # when it already meets the quorum rule
+            risky = outcome is None and len({vote['vote'] for vote in cast}) == 1 and cast[0]['vote'] != 'ABSTAIN'
+            if outcome is not None or (not risky and self._is_decided(cast, len(later))):
+                reason = f"decided after tier '{tier_name}'"
+                return cast, tiers_run, {agent['name']: reason for agent in later}, outcome
+            if risky:
+                print(f"\n🪜 Tier '{tier_name}' agrees outside the risk thresholds, "
+                      f"escalating to tier '{plan[index + 1][0]}'")
+            else:
+                print(f"\n🪜 Tier '{tier_name}' is split, escalating to tier '{plan[index + 1][0]}'")
+
+    def _finish_pending_votes(self, pending: List, tasks: Dict, result: Dict, cache_key: str = None):
+        """
+        Cancel the votes that are no longer needed, or let them finish in the
+        background and append them to result['late_votes'] for the audit trail.
+        Once the last one is in, the cached decision is refreshed and
+        on_late_votes is told, since callers already got (and may have stored)
+        the result without them. Background votes only survive as long as the
+        event loop does.
+        """
+        result['pending_agents'] = [tasks[task]['name'] for task in pending]
+        if not self.finish_in_background:
+            for task in pending:
+                task.cancel()
+            return
+
+        result['late_votes'] = []
+        remaining = set(pending)
+        if pending:
+            self._late_votes_pending.add(result['decision_id'])
+
+        def record_late_vote(task):
+            self._background_tasks.discard(task)
+            remaining.discard(task)
+            if not task.cancelled() and task.exception() is None:
+                result['late_votes'].append(task.result())
+            if remaining:
+                return
+            if cache_key is not None:
+                self._store_in_cache(cache_key, result)
+            try:
+                if self.on_late_votes is not None:
+                    self.on_late_votes(result['decision_id'], copy.deepcopy(result['late_votes']))
+            except Exception as e:
+                print(f"Error recording late votes for {result['decision_id']}: {e}")
+            finally:
+                # Only after on_late_votes, so a store racing it sees one or the other
+                self._late_votes_pending.discard(result['decision_id'])
+
+        for task in pending:
+            self._background_tasks.add(task)
+            task.add_done_callback(record_late_vote)
+
+    def late_votes_pending(self, decision_id: str) -> bool:
+        """
+        Whether decision_id still has background votes running (see
+        _finish_pending_votes); on_late_votes will be called for it.
+        """
+        return decision_id in self._late_votes_pending
+
+    def _print_vote(self, vote: Dict):
+        print(f"\n{vote['emoji']} {vote['agent_name']} ({vote['model']})")
+        print(f"   Vote: {vote['vote']}")
+        print(f"   Risk Score: {vote['risk_score']}/10")
+        print(f"   Reasoning: {vote['reasoning']}")
+        if vote['conditions']:
+            print(f"   Conditions: {vote['conditions']}")
+
+    def _build_result(self, agent_votes: List[Dict], purchase_request: Dict) -> Dict:
+        """
+        Tally the votes into the consensus result returned by evaluate_purchase.
         """
-        print(f"\n{'='*60}")
-        print(f"🔍 EVALUATING PURCHASE REQUEST")
-        print(f"{'='*60}")
-        print(f"Amount: ${purchase_request['amount']}")
-        print(f"Purpose: {purchase_request['purpose']}")
-        print(f"\n⏳ Gathering votes from 5 agents...\n")
-        
-        # Get votes from all agents in parallel
-        tasks = [self.get_agent_vote(agent, purchase_request) for agent in self.agents]
-        agent_votes = await asyncio.gather(*tasks)
-        
-        # Print each agent's vote
-        for vote in agent_votes:
-            print(f"\n{vote['emoji']} {vote['agent_name']} ({vote['model']})")
-            print(f"   Vote: {vote['vote']}")
-            print(f"   Risk Score: {vote['risk_score']}/10")
-            print(f"   Reasoning: {vote['reasoning']}")
-            if vote['conditions']:
-                print(f"   Conditions: {vote['conditions']}")
-        
-        # Calculate consensus
         yes_votes = sum(1 for v in agent_votes if v['vote'] == 'YES')
         no_votes = sum(1 for v in agent_votes if v['vote'] == 'NO')
         abstain_votes = sum(1 for v in agent_votes if v['vote'] == 'ABSTAIN')
-        
+
         # Decision requires majority (3+ YES votes)
-        approved = yes_votes >= 3
-        
+        approved = yes_votes >= self.approval_threshold
+
         # Calculate average risk score
         risk_scores = [v['risk_score'] for v in agent_votes if v['risk_score'] > 0]
         avg_risk = sum(risk_scores) / len(risk_scores) if risk_scores else 0
-        
-        result = {
+
+        return {
+            "decision_id": uuid.uuid4().hex[:16],
             "approved": approved,
             "yes_votes": yes_votes,
             "no_votes": no_votes,
@@ -204,20 +741,483 @@ Format your response as JSON:
             "agent_votes": agent_votes,
             "purchase_request": purchase_request
         }
-        
-        # Print final decision
+
+    def _tally(self, agent_votes: List[Dict], pending_count: int) -> Dict:
+        """
+        Running vote counts while agents are still voting.
+        """
+        yes_votes = sum(1 for v in agent_votes if v['vote'] == 'YES')
+        return {
+            "yes_votes": yes_votes,
+            "no_votes": sum(1 for v in agent_votes if v['vote'] == 'NO'),
+            "abstain_votes": sum(1 for v in agent_votes if v['vote'] == 'ABSTAIN'),
+            "pending": pending_count,
+            "decided": self._is_decided(agent_votes, pending_count),
+            "approved": yes_votes >= self.approval_threshold
+        }
+
+    def _prescreen(self, purchase_request: Dict):
+        """
+        Run the policy rules. Returns a result in the evaluate_purchase shape,
+        marked with the deciding rule, or None when the quorum must decide.
+        """
+        if self.policy is None:
+            return None
+        rule = self.policy.evaluate(purchase_request)
+        if rule is None or rule.action == ESCALATE:
+            return None
+
+        result = self._build_result([], purchase_request)
+        result['approved'] = rule.action == 'approve'
+        result['decided_by'] = 'policy'
+        result['policy_rule'] = rule.name
+        result['policy_reason'] = rule.reason
+        print(f"\n📏 Policy rule '{rule.name}' {'APPROVED' if result['approved'] else 'DENIED'} "
+              f"${purchase_request['amount']} {purchase_request['purpose']}: {rule.reason}")
+        return result
+
+    def _lookup_cache(self, purchase_request: Dict):
+        """
+        Returns (cache_key, cached_result); both None when caching is off.
+        """
+        if self.cache is None:
+            return None, None
+        cache_key = make_cache_key(purchase_request, self.agents)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            # A served copy is its own decision, linked to the one it repeats
+            cached['cached_from'] = cached.get('decision_id')
+            cached['decision_id'] = uuid.uuid4().hex[:16]
+            cached['cached'] = True
+            print(f"\n♻️  Cached decision for ${purchase_request['amount']} {purchase_request['purpose']}: "
+                  f"{'APPROVED' if cached['approved'] else 'DENIED'}")
+        return cache_key, cached
+
+    def _lookup_similar(self, purchase_request: Dict):
+        """
+        A prior decision on a near-duplicate request, marked as reused and
+        linked to its source, or None when nothing is similar enough.
+        """
+        if self.similarity_index is None:
+            return None
+        source, similarity = self.similarity_index.find(purchase_request)
+        if source is None:
+            return None
+        result = dict(source)
+        result['decision_id'] = uuid.uuid4().hex[:16]
+        result['purchase_request'] = purchase_request
+        result['decided_by'] = 'similarity'
+        result['reused'] = True
+        result['reused_from'] = {
+            "decision_id": source['decision_id'],
+            "similarity": round(similarity, 3),
+            "purchase_request": source['purchase_request']
+        }
+        print(f"\n🪞 Reusing decision {source['decision_id']} ({similarity:.0%} similar) for "
+              f"${purchase_request['amount']} {purchase_request['purpose']}: "
+              f"{'APPROVED' if result['approved'] else 'DENIED'}")
+        return result
+
+    def _store_in_cache(self, cache_key: str, result: Dict):
+        # Degraded decisions (timeouts/errors) are not worth replaying
+        if any(v.get('source') in ('timeout', 'error', 'circuit_open') for v in result['agent_votes']):
+            return
+        if cache_key is not None:
+            self.cache.set(cache_key, result)
+        if self.similarity_index is not None:
+            self.similarity_index.add(result['purchase_request'], result)
+
+    def _print_decision(self, result: Dict):
         print(f"\n{'='*60}")
-        if approved:
+        if result['approved']:
             print(f"✅ PURCHASE APPROVED")
         else:
             print(f"❌ PURCHASE DENIED")
         print(f"{'='*60}")
-        print(f"Votes: {yes_votes} YES, {no_votes} NO, {abstain_votes} ABSTAIN")
-        print(f"Average Risk Score: {avg_risk:.2f}/10")
+        print(f"Votes: {result['yes_votes']} YES, {result['no_votes']} NO, {result['abstain_votes']} ABSTAIN")
+        print(f"Average Risk Score: {result['average_risk_score']:.2f}/10")
         print(f"{'='*60}\n")
-        
+
+    async def evaluate_purchase(self, purchase_request: Dict, early_exit: bool = None,
+                                include_timings: bool = False) -> Dict:
+        """
+        Main function: Get all 5 agents to vote on a purchase request.
+        Returns consensus decision and all agent votes.
+
+        With early_exit, returns as soon as 3 YES votes are in or approval has
+        become impossible, instead of waiting on the slowest agent.
+        With include_timings, result['timings'] breaks down where the time went.
+        """
+        started = time.perf_counter()
+        if self.coalesce:
+            result = await self._evaluate_single_flight(purchase_request, early_exit)
+        else:
+            result = await self._evaluate(purchase_request, early_exit)
+        return self._observe_decision(result, started, include_timings)
+
+    async def _evaluate_single_flight(self, purchase_request: Dict, early_exit: bool = None) -> Dict:
+        """
+        Run _evaluate once for identical concurrent requests (same cache key and
+        early_exit): the first caller starts it, later callers await the same
+        task. Errors reach every caller; a caller that is cancelled only stops
+        the shared evaluation if it was the last one waiting. Shared results are
+        copied per caller so nobody sees another caller's changes.
+        """
+        if early_exit is None:
+            early_exit = self.early_exit
+        key = (asyncio.get_running_loop(), make_cache_key(purchase_request, self.agents), early_exit)
+
+        entry = self._in_flight.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(self._evaluate(purchase_request, early_exit))
+            entry = self._in_flight[key] = {"task": task, "waiters": 0, "callers": 0}
+
+            def forget(_, entry=entry):
+                if self._in_flight.get(key) is entry:
+                    del self._in_flight[key]
+
+            task.add_done_callback(forget)
+        else:
+            COALESCED.inc()
+            print(f"🔗 Joining in-flight evaluation of ${purchase_request['amount']} {purchase_request['purpose']}")
+
+        entry['waiters'] += 1
+        entry['callers'] += 1
+        try:
+            result = await asyncio.shield(entry['task'])
+        finally:
+            entry['waiters'] -= 1
+            if entry['waiters'] == 0 and not entry['task'].done():
+                # Everyone waiting went away: stop the round
+                if self._in_flight.get(key) is entry:
+                    del self._in_flight[key]
+                entry['task'].cancel()
+        return copy.deepcopy(result) if entry['callers'] > 1 else result
+
+    def _observe_decision(self, result: Dict, started: float, include_timings: bool = False) -> Dict:
+        """
+        Record end-to-end decision latency and outcome metrics.
+        """
+        elapsed = time.perf_counter() - started
+        decided_by = result.get('decided_by') or ('cache' if result.get('cached') else 'quorum')
+        DECISION_LATENCY.observe(elapsed, decided_by=decided_by)
+        DECISIONS.inc(decided_by=decided_by, approved=str(result['approved']).lower())
+        if include_timings:
+            result['timings'] = {
+                "total_ms": round(elapsed * 1000, 1),
+                "decided_by": decided_by,
+                # Replayed (cached) votes did not cost any time in this call
+                "agents_ms": {
+                    vote['agent_name']: vote.get('latency_ms') for vote in result['agent_votes']
+                } if decided_by == 'quorum' else {}
+            }
         return result
 
+    async def _evaluate(self, purchase_request: Dict, early_exit: bool = None) -> Dict:
+        if early_exit is None:
+            early_exit = self.early_exit
+
+        prescreened = self._prescreen(purchase_request)
+        if prescreened is not None:
+            return prescreened
+
+        cache_key, cached = self._lookup_cache(purchase_request)
+        if cached is not None:
+            return cached
+
+        reused = self._lookup_similar(purchase_request)
+        if reused is not None:
+            return reused
+
+        print(f"\n{'='*60}")
+        print(f"🔍 EVALUATING PURCHASE REQUEST")
+        print(f"{'='*60}")
+        print(f"Amount: ${purchase_request['amount']}")
+        print(f"Purpose: {purchase_request['purpose']}")
+        deferred, tiers_run, outcome = {}, None, None
+        if self.tiers is not None:
+            print(f"\n⏳ Gathering votes tier by tier...\n")
+            agent_votes, tiers_run, skipped, outcome = await self._collect_tiered_votes(purchase_request)
+            pending, tasks = [], {}
+        else:
+            if self.router is not None:
+                deferred = self.router.plan(self.agents, purchase_request, self.approval_threshold)
+            if deferred:
+                print(f"\n⏳ Gathering votes from {len(self.agents) - len(deferred)} agents "
+                      f"({len(deferred)} deferred)...\n")
+            else:
+                print(f"\n⏳ Gathering votes from 5 agents...\n")
+
+            # Get votes from all agents in parallel
+            agent_votes, pending, tasks, skipped = await self._collect_votes(purchase_request, early_exit, deferred)
+
+        # Print each agent's vote
+        for vote in agent_votes:
+            self._print_vote(vote)
+
+        result = self._build_result(agent_votes, purchase_request)
+
+        if tiers_run is not None:
+            result['tiers_run'] = tiers_run
+            if outcome is not None:
+                # Unanimous, confident early tier: its votes decide
+                result['approved'] = outcome
+                result['decided_at_tier'] = tiers_run[-1]
+        if deferred or tiers_run is not None:
+            result['skipped_agents'] = [
+                {"agent_name": name, "reason": reason} for name, reason in skipped.items()
+            ]
+            for name in skipped:
+                AGENTS_SKIPPED.inc(agent=name)
+            if skipped:
+                print(f"\n🔀 Skipped {', '.join(skipped)}: outcome settled without them")
+        if self.router is not None:
+            self.router.record(purchase_request, result)
+
+        if early_exit:
+            result['early_exit'] = bool(pending)
+            self._finish_pending_votes(pending, tasks, result, cache_key)
+            if pending:
+                print(f"\n⚡ Quorum reached early, {len(pending)} vote(s) not awaited")
+
+        # Print final decision
+        self._print_decision(result)
+
+        # A decision missing early-exit votes is not cached for callers who want
+        # the full quorum; with finish_in_background it is once the late votes are in
+        if not pending:
+            self._store_in_cache(cache_key, result)
+
+        return result
+
+    async def evaluate_batch(self, purchase_requests: List[Dict], early_exit: bool = None,
+                             max_concurrency: int = 16, votes_per_prompt: int = 1) -> List[Dict]:
+        """
+        Evaluate many purchase requests concurrently on the current loop.
+        At most max_concurrency evaluations run at once. Returns one entry per
+        request in input order, either {"success": True, "result": ...} or
+        {"success": False, "error": ...}, so one bad item never fails the batch.
+
+        With votes_per_prompt > 1, each agent votes on up to that many requests
+        per LLM call (see get_agent_votes_batch), cutting provider calls ~K-fold.
+        """
+        if votes_per_prompt > 1:
+            return await self._evaluate_batch_prompted(purchase_requests, votes_per_prompt, max_concurrency)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def evaluate_one(purchase_request: Dict) -> Dict:
+            async with semaphore:
+                try:
+                    result = await self.evaluate_purchase(purchase_request, early_exit=early_exit)
+                    return {"success": True, "result": result}
+                except Exception as e:
+                    print(f"Error evaluating batch item: {e}")
+                    return {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        return list(await asyncio.gather(*(evaluate_one(r) for r in purchase_requests)))
+
+    async def _evaluate_batch_prompted(self, purchase_requests: List[Dict], votes_per_prompt: int,
+                                       max_concurrency: int) -> List[Dict]:
+        """
+        evaluate_batch with multi-request prompts: cache hits are served first,
+        the remaining requests are chunked and every agent votes per chunk.
+        """
+        started = time.perf_counter()
+        results = [None] * len(purchase_requests)
+        misses = []  # (index, cache_key, purchase_request)
+        for i, purchase_request in enumerate(purchase_requests):
+            try:
+                if not isinstance(purchase_request, dict):
+                    raise TypeError("purchase request must be an object")
+                self._format_request(purchase_request)
+                prescreened = self._prescreen(purchase_request)
+                if prescreened is not None:
+                    results[i] = {"success": True, "result": self._observe_decision(prescreened, started)}
+                    continue
+                cache_key, cached = self._lookup_cache(purchase_request)
+                if cached is None:
+                    cached = self._lookup_similar(purchase_request)
+                if cached is not None:
+                    results[i] = {"success": True, "result": self._observe_decision(cached, started)}
+                else:
+                    misses.append((i, cache_key, purchase_request))
+            except Exception as e:
+                results[i] = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        chunks = [misses[j:j + votes_per_prompt] for j in range(0, len(misses), votes_per_prompt)]
+        calls = [(agent, chunk) for chunk in chunks for agent in self.agents]
+        print(f"\n📦 Batched voting: {len(misses)} request(s) in {len(chunks)} chunk(s), "
+              f"{len(calls)} agent call(s)")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def vote_chunk(agent: Dict, chunk: List) -> List[Dict]:
+            async with semaphore:
+                return await self.get_agent_votes_batch(agent, [item[2] for item in chunk])
+
+        chunk_votes = await asyncio.gather(*(vote_chunk(agent, chunk) for agent, chunk in calls))
+
+        votes_by_request = {}  # index -> agent name -> vote
+        for (agent, chunk), votes in zip(calls, chunk_votes):
+            for (i, _, _), vote in zip(chunk, votes):
+                votes_by_request.setdefault(i, {})[agent['name']] = vote
+
+        for i, cache_key, purchase_request in misses:
+            try:
+                agent_votes = [votes_by_request[i][agent['name']] for agent in self.agents]
+                result = self._build_result(agent_votes, purchase_request)
+                result['batched'] = True
+                self._print_decision(result)
+                self._store_in_cache(cache_key, result)
+                results[i] = {"success": True, "result": self._observe_decision(result, started)}
+            except Exception as e:
+                print(f"Error evaluating batch item: {e}")
+                results[i] = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        return results
+
+    async def stream_evaluation(self, purchase_request: Dict):
+        """
+        Evaluate a purchase request and yield events as they happen, for
+        streaming clients: a 'vote' event as each agent finishes (fastest
+        first), a 'tally' event after each vote, then the 'decision' event
+        carrying the same result evaluate_purchase would return.
+        With coalescing, identical concurrent streams share one round.
+        Streams always ask every agent at once and wait for all of them:
+        escalation tiers, router deferral and early exit are not applied, so
+        each vote can be shown. The router still learns from the decision.
+        """
+        started = time.perf_counter()
+        prescreened = self._prescreen(purchase_request)
+        if prescreened is not None:
+            yield {"event": "decision", "data": self._observe_decision(prescreened, started)}
+            return
+
+        cache_key, cached = self._lookup_cache(purchase_request)
+        if cached is None:
+            cached = self._lookup_similar(purchase_request)
+        if cached is not None:
+            yield {"event": "decision", "data": self._observe_decision(cached, started)}
+            return
+
+        if self.coalesce:
+            events = self._stream_single_flight(purchase_request, cache_key)
+        else:
+            events = self._stream_round(purchase_request, cache_key)
+        async for event in events:
+            if event['event'] == 'decision':
+                event = {"event": "decision", "data": self._observe_decision(event['data'], started)}
+            yield event
+
+    async def _stream_round(self, purchase_request: Dict, cache_key: str):
+        """
+        One streamed quorum round: vote and tally events as agents finish,
+        then the raw decision.
+        """
+        started = time.perf_counter()
+        tasks = [
+            asyncio.ensure_future(self.get_agent_vote(agent, purchase_request))
+            for agent in self.agents
+        ]
+        finished = {}  # agent name -> vote
+        try:
+            try:
+                for next_vote in asyncio.as_completed(tasks, timeout=self.decision_timeout):
+                    vote = await next_vote
+                    finished[vote['agent_name']] = vote
+                    yield {"event": "vote", "data": vote}
+                    yield {"event": "tally", "data": self._tally(list(finished.values()), len(tasks) - len(finished))}
+            except asyncio.TimeoutError:
+                print(f"⏱️  Decision deadline of {self.decision_timeout}s reached")
+                for agent in self.agents:
+                    if agent['name'] not in finished:
+                        vote = self._record_vote(self._abstain_vote(
+                            agent, f"No response within decision deadline of {self.decision_timeout}s",
+                            source="timeout"
+                        ), started)
+                        finished[agent['name']] = vote
+                        yield {"event": "vote", "data": vote}
+        finally:
+            # Client went away or deadline hit: stop the remaining agents
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        agent_votes = [finished[agent['name']] for agent in self.agents]
+        result = self._build_result(agent_votes, purchase_request)
+        if self.router is not None:
+            self.router.record(purchase_request, result)
+        self._print_decision(result)
+        self._store_in_cache(cache_key, result)
+        yield {"event": "decision", "data": result}
+
+    async def _stream_single_flight(self, purchase_request: Dict, cache_key: str):
+        """
+        Share one _stream_round between identical concurrent streams (e.g. a
+        dashboard double submit): the first caller starts it, later callers
+        replay the events so far and then follow live. The round is cancelled
+        once every subscriber has gone away. Each caller gets its own copy of
+        the decision.
+        """
+        # Keyed on the request itself: cache_key is None when caching is off
+        key = (asyncio.get_running_loop(), make_cache_key(purchase_request, self.agents))
+        entry = self._streams_in_flight.get(key)
+        if entry is None:
+            entry = self._streams_in_flight[key] = {"history": [], "queues": set()}
+            entry['task'] = asyncio.ensure_future(self._broadcast_round(purchase_request, cache_key, entry))
+
+            def forget(_, entry=entry):
+                if self._streams_in_flight.get(key) is entry:
+                    del self._streams_in_flight[key]
+
+            entry['task'].add_done_callback(forget)
+        else:
+            COALESCED.inc()
+            print(f"🔗 Joining in-flight stream of ${purchase_request['amount']} {purchase_request['purpose']}")
+
+        queue = asyncio.Queue()
+        for item in entry['history']:
+            queue.put_nowait(item)
+        entry['queues'].add(queue)
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                if item['event'] == 'decision':
+                    item = {"event": "decision", "data": copy.deepcopy(item['data'])}
+                yield item
+        finally:
+            entry['queues'].discard(queue)
+            if not entry['queues'] and not entry['task'].done():
+                # Everyone subscribed went away: stop the round
+                if self._streams_in_flight.get(key) is entry:
+                    del self._streams_in_flight[key]
+                entry['task'].cancel()
+
+    async def _broadcast_round(self, purchase_request: Dict, cache_key: str, entry: Dict):
+        """
+        Run _stream_round, recording every event (then None, or the error that
+        ended it) in entry['history'] and handing it to each subscriber queue.
+        """
+        def publish(item):
+            entry['history'].append(item)
+            for queue in entry['queues']:
+                queue.put_nowait(item)
+
+        try:
+            async for event in self._stream_round(purchase_request, cache_key):
+                publish(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            publish(e)
+            return
+        publish(None)
+
 
 async def main():
     """
@@ -269,6 +1269,8 @@ async def main():
     
     print("\n\n🎯 SCENARIO 3: Strategic Investment")
     result_3 = await consensus_system.evaluate_purchase(purchase_request_3)
+
+    await close_client()
     
     # Return results for further processing
     return {
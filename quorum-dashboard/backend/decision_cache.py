@@ -0,0 +1,233 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+def _normalize_text(value) -> str:
+    return " ".join(str(value or "").split()).lower()
+
+
+def normalize_request(purchase_request: Dict) -> Dict:
+    """
+    Reduce a purchase request to the fields that affect the decision, so that
+    whitespace/casing differences and number formatting map to the same key.
+    """
+    def _amount(value):
+        try:
+            return round(float(value), 2)
+        except (TypeError, ValueError):
+            return _normalize_text(value)
+
+    return {
+        "amount": _amount(purchase_request.get('amount')),
+        "purpose": _normalize_text(purchase_request.get('purpose')),
+        "requesting_agent": _normalize_text(purchase_request.get('requesting_agent')),
+        "justification": _normalize_text(purchase_request.get('justification')),
+        "expected_roi": _normalize_text(purchase_request.get('expected_roi', 'Not specified')),
+        "urgency": _normalize_text(purchase_request.get('urgency', 'Medium')),
+        "budget_remaining": _amount(purchase_request.get('budget_remaining', 'Unknown')),
+    }
+
+
+def make_cache_key(purchase_request: Dict, agents: List[Dict]) -> str:
+    """
+    Cache key: the normalized request plus the agent roster and models, so a
+    roster or model change never serves decisions made by a different quorum.
+    """
+    roster = [
+        [agent['name'], agent['model'], agent.get('fallback_model'), agent['role'], agent['persona']]
+        for agent in agents
+    ]
+    payload = json.dumps([normalize_request(purchase_request), roster], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class MemoryDecisionCache:
+    """
+    In-memory LRU cache of evaluate_purchase results with a TTL.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl and time.time() - entry[0] > self.ttl:
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            # Stored as JSON so callers can never mutate the cached copy
+            return json.loads(entry[1])
+
+    def set(self, key: str, result: Dict):
+        with self._lock:
+            self._entries[key] = (time.time(), json.dumps(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0
+            }
+
+
+class SQLiteDecisionCache:
+    """
+    On-disk cache of evaluate_purchase results, shared across restarts.
+    Entries expire after the TTL and the least recently used ones are evicted
+    once max_entries is exceeded.
+
+    Hits are a read only: their last_used times are kept in memory and
+    written in one batch (with one commit) on the next set(), once
+    flush_every hits have piled up or flush_interval seconds have passed,
+    so a hit never waits on a disk sync.
+    """
+
+    def __init__(self, path: str = 'decision_cache.db', max_entries: int = 10000, ttl: float = 86400,
+                 flush_every: int = 256, flush_interval: float = 5.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._touched = {}  # key -> last_used not written yet
+        self._dirty = False  # uncommitted expiry deletes
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS decisions ("
+            " key TEXT PRIMARY KEY, result TEXT NOT NULL,"
+            " created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_decisions_last_used ON decisions (last_used)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, created_at FROM decisions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM decisions WHERE key = ?", (key,))
+                self._touched.pop(key, None)
+                self._dirty = True
+                self.evictions += 1
+                row = None
+            if row is None:
+                self.misses += 1
+            else:
+                self._touched[key] = now
+                self.hits += 1
+            if (len(self._touched) >= self.flush_every
+                    or time.monotonic() - self._flushed_at >= self.flush_interval):
+                self._flush()
+            return None if row is None else json.loads(row[0])
+
+    def _flush(self, commit: bool = True):
+        """
+        Write the pending last_used times. Called with the lock held.
+        """
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE decisions SET last_used = ? WHERE key = ?",
+                [(last_used, key) for key, last_used in self._touched.items()]
+            )
+            self._touched.clear()
+            self._dirty = True
+        if commit and self._dirty:
+            self._conn.commit()
+            self._dirty = False
+        self._flushed_at = time.monotonic()
+
+    def set(self, key: str, result: Dict):
+        now = time.time()
+        with self._lock:
+            # Eviction below goes by last_used, so pending hits must be written first
+            self._flush(commit=False)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO decisions (key, result, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(result), now, now)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM decisions").fetchone()[0]
+            if count > self.max_entries:
+                overflow = count - self.max_entries
+                self._conn.execute(
+                    "DELETE FROM decisions WHERE key IN"
+                    " (SELECT key FROM decisions ORDER BY last_used LIMIT ?)", (overflow,)
+                )
+                self.evictions += overflow
+            self._conn.commit()
+            self._dirty = False
+
+    def clear(self):
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM decisions")
+            self._conn.commit()
+            self._dirty = False
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._flush()
+            entries = self._conn.execute("SELECT COUNT(*) FROM decisions").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "backend": "sqlite",
+                "path": self.path,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0
+            }
+
+
+def create_decision_cache(backend: str = 'memory', **kwargs):
+    """
+    Build a cache from a backend name ('memory', 'sqlite' or 'none').
+    """
+    if backend in (None, '', 'none', 'off'):
+        return None
+    if backend == 'memory':
+        return MemoryDecisionCache(**kwargs)
+    if backend == 'sqlite':
+        return SQLiteDecisionCache(**kwargs)
+    raise ValueError(f"Unknown decision cache backend: {backend}")
@@ -0,0 +1,64 @@
+import asyncio
+import os
+import weakref
+
+import httpx
+from dotenv import load_dotenv
+from dedalus_labs import AsyncDedalus, DedalusRunner, DefaultAsyncHttpxClient
+
+load_dotenv()
+
+# Connection pool limits for the shared HTTP client
+MAX_CONNECTIONS = int(os.getenv('QUORUM_HTTP_MAX_CONNECTIONS', '100'))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('QUORUM_HTTP_MAX_KEEPALIVE', '20'))
+KEEPALIVE_EXPIRY = float(os.getenv('QUORUM_HTTP_KEEPALIVE_EXPIRY', '60'))
+
+# httpx connections belong to the event loop that opened them, so the shared
+# client is kept per loop. With one long-lived loop this is one client per process.
+_pool = weakref.WeakKeyDictionary()
+
+
+def _create_client() -> AsyncDedalus:
+    http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY
+        )
+    )
+    # Retries are handled per provider in the consensus path (see provider_health.py)
+    return AsyncDedalus(http_client=http_client, max_retries=0)
+
+
+def _entry():
+    loop = asyncio.get_running_loop()
+    entry = _pool.get(loop)
+    if entry is None:
+        client = _create_client()
+        entry = (client, DedalusRunner(client))
+        _pool[loop] = entry
+    return entry
+
+
+def get_client() -> AsyncDedalus:
+    """
+    Shared AsyncDedalus client (with keep-alive connection pool) for the running loop.
+    """
+    return _entry()[0]
+
+
+def get_runner() -> DedalusRunner:
+    """
+    Shared DedalusRunner bound to the pooled client. Runners hold no per-run
+    state, so one instance serves every concurrent call.
+    """
+    return _entry()[1]
+
+
+async def close_client():
+    """
+    Close the pooled client of the running loop, if one was created.
+    """
+    entry = _pool.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        await entry[0].close()
@@ -0,0 +1,102 @@
+import json
+import os
+from typing import Dict, List, Optional
+
+
+def _risk(vote: Dict) -> Optional[float]:
+    try:
+        return float(vote.get('risk_score'))
+    except (TypeError, ValueError):
+        return None
+
+
+class EscalationTiers:
+    """
+    Cost-tiered evaluation: agents vote tier by tier (cheap and fast first).
+    After each tier, if every vote cast so far agrees - all YES with each risk
+    score at most approve_max_risk, or all NO with each risk score at least
+    deny_min_risk - the decision is made without the later tiers. Otherwise
+    the next tier is asked. Once every tier has voted, the normal quorum rule
+    decides. Agents not named in any tier form an implicit last tier.
+
+    Config:
+      {"tiers": [{"name": "fast", "agents": ["Operations Agent", ...]}, ...],
+       "approve_max_risk": 4, "deny_min_risk": 7}
+    """
+
+    def __init__(self, tiers: List[Dict], approve_max_risk: float = 4, deny_min_risk: float = 7):
+        names = [tier.get('name') for tier in tiers]
+        if not tiers or not all(names) or len(set(names)) != len(names):
+            raise ValueError("Escalation tiers need at least one tier, each with a unique name")
+        for tier in tiers:
+            if not tier.get('agents'):
+                raise ValueError(f"Escalation tier {tier['name']!r} has no agents")
+        self.tiers = tiers
+        self.approve_max_risk = approve_max_risk
+        self.deny_min_risk = deny_min_risk
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'EscalationTiers':
+        return cls(
+            [{"name": tier['name'], "agents": list(tier['agents'])} for tier in config.get('tiers', [])],
+            approve_max_risk=config.get('approve_max_risk', 4),
+            deny_min_risk=config.get('deny_min_risk', 7)
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> 'EscalationTiers':
+        with open(path) as f:
+            return cls.from_config(json.load(f))
+
+    def plan(self, agents: List[Dict]) -> List[tuple]:
+        """
+        The roster split into (tier name, agents) in tier order.
+        Raises ValueError for agent names that are not in the roster.
+        """
+        roster = {agent['name']: agent for agent in agents}
+        unknown = {name for tier in self.tiers for name in tier['agents']} - set(roster)
+        if unknown:
+            raise ValueError(f"Escalation tiers name unknown agents: {sorted(unknown)}")
+
+        planned, seen = [], set()
+        for tier in self.tiers:
+            tier_agents = [roster[name] for name in tier['agents'] if name not in seen]
+            seen.update(agent['name'] for agent in tier_agents)
+            if tier_agents:
+                planned.append((tier['name'], tier_agents))
+        rest = [agent for agent in agents if agent['name'] not in seen]
+        if rest:
+            planned.append(('remaining', rest))
+        return planned
+
+    def settle(self, votes: List[Dict]) -> Optional[bool]:
+        """
+        True/False when the votes cast so far agree strongly enough to decide,
+        None to escalate to the next tier.
+        """
+        if not votes:
+            return None
+        risks = [_risk(v) for v in votes]
+        if None in risks:
+            return None
+        if all(v['vote'] == 'YES' and risk <= self.approve_max_risk for v, risk in zip(votes, risks)):
+            return True
+        if all(v['vote'] == 'NO' and risk >= self.deny_min_risk for v, risk in zip(votes, risks)):
+            return False
+        return None
+
+
+def load_tiers(path: str = None) -> Optional[EscalationTiers]:
+    """
+    Load escalation tiers from QUORUM_TIERS_PATH (e.g. escalation_tiers.json
+    next to this file). Returns None - every agent votes at once - when the
+    path is 'none' (the default) or the file does not exist.
+    """
+    path = path or os.getenv('QUORUM_TIERS_PATH', 'none')
+    if path.lower() == 'none':
+        return None
+    if not os.path.isabs(path) and not os.path.exists(path):
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+    if not os.path.exists(path):
+        return None
+    return EscalationTiers.from_file(path)
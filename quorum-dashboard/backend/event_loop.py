@@ -0,0 +1,107 @@
+import asyncio
+import atexit
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class BackgroundEventLoop:
+    """
+    One long-lived asyncio loop running in a daemon thread.
+
+    Sync Flask views hand their coroutines to this loop instead of calling
+    asyncio.run() per request, so every evaluation shares the same loop and
+    the same pooled Dedalus client, and many of them run concurrently.
+    The loop is started lazily, so forked server workers each get their own.
+    """
+
+    def __init__(self, name: str = 'quorum-event-loop'):
+        self.name = name
+        self.loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self.loop is None or self.loop.is_closed():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run_forever():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run_forever, name=self.name, daemon=True)
+                self._thread.start()
+                ready.wait()
+                self.loop = loop
+            return self.loop
+
+    def submit(self, coro) -> Future:
+        """
+        Schedule a coroutine on the loop and return a concurrent Future.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.start())
+
+    def run(self, coro, timeout: float = None):
+        """
+        Run a coroutine on the loop and block the calling thread for its result.
+        """
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def iterate(self, agen):
+        """
+        Consume an async generator on the loop from a sync generator, e.g. to
+        stream it from a Flask response. Closing the sync generator (client
+        disconnect) cancels the async one.
+        """
+        items = queue.Queue()
+        done = object()
+
+        async def pump():
+            try:
+                async for item in agen:
+                    items.put(item)
+            except Exception as e:
+                items.put(e)
+            finally:
+                items.put(done)
+
+        future = self.submit(pump())
+        try:
+            while True:
+                item = items.get()
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            future.cancel()
+
+    def stop(self):
+        with self._lock:
+            if self.loop is None or self.loop.is_closed():
+                return
+            loop = self.loop
+
+            def shutdown():
+                # Cancel in-flight work (queued jobs, background votes) first
+                for task in asyncio.all_tasks(loop):
+                    task.cancel()
+                loop.call_later(0.1, loop.stop)
+
+            loop.call_soon_threadsafe(shutdown)
+            self._thread.join(timeout=5)
+            if not self.loop.is_running():
+                self.loop.close()
+
+
+background_loop = BackgroundEventLoop()
+atexit.register(background_loop.stop)
@@ -0,0 +1,141 @@
+import asyncio
+import json
+import random
+import re
+from typing import Dict, Optional
+
+# Per-model latency (median seconds, lognormal sigma), loosely shaped after
+# what the real providers show; o1 is the slow tail of the quorum
+DEFAULT_MODEL_PROFILES = {
+    "anthropic/claude-sonnet-4-20250514": {"median": 3.0, "sigma": 0.4},
+    "anthropic/claude-3-5-haiku-20241022": {"median": 0.8, "sigma": 0.3},
+    "openai/gpt-4.1": {"median": 2.0, "sigma": 0.35},
+    "openai/gpt-4o-mini": {"median": 0.8, "sigma": 0.3},
+    "openai/o1": {"median": 8.0, "sigma": 0.5},
+    "xai/grok-2-1212": {"median": 1.5, "sigma": 0.4},
+}
+DEFAULT_PROFILE = {"median": 1.0, "sigma": 0.3}
+
+_REQUEST_ID = re.compile(r"REQUEST ID: (R\d+)")
+
+
+class FakeProviderError(Exception):
+    # Looks like a 503 so it counts as transient (see provider_health.is_transient)
+    status_code = 503
+
+
+class _RunResult:
+    def __init__(self, final_output: str):
+        self.final_output = final_output
+
+
+class _Delta:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class _Choice:
+    def __init__(self, content: str):
+        self.delta = _Delta(content)
+
+
+class _Chunk:
+    def __init__(self, content: str):
+        self.choices = [_Choice(content)]
+
+
+class FakeDedalusRunner:
+    """
+    Offline stand-in for DedalusRunner. Each call sleeps for a latency drawn
+    from the model's lognormal profile, fails with the model's error rate, and
+    answers with a templated vote, vote array (batched prompts) or action plan
+    (planner prompts). Supports stream=True with OpenAI-style chunks.
+
+    Profiles: {model: {"median": s, "sigma": s, "error_rate": p, "yes_rate": p,
+    "output": "canned text"}}; latency_scale shrinks every latency, e.g. 0.01
+    to benchmark quickly while keeping the shape of the distribution.
+    """
+
+    def __init__(self, profiles: Optional[Dict] = None, latency_scale: float = 1.0,
+                 error_rate: float = 0.0, yes_rate: float = 0.7, seed: Optional[int] = None):
+        self.profiles = dict(DEFAULT_MODEL_PROFILES)
+        self.profiles.update(profiles or {})
+        self.latency_scale = latency_scale
+        self.error_rate = error_rate
+        self.yes_rate = yes_rate
+        self.random = random.Random(seed)
+        self.calls = 0
+
+    def _profile(self, model: str) -> Dict:
+        return self.profiles.get(model, DEFAULT_PROFILE)
+
+    def _latency(self, model: str) -> float:
+        profile = self._profile(model)
+        return self.random.lognormvariate(0, profile.get("sigma", 0.3)) * profile["median"] * self.latency_scale
+
+    def _vote(self, profile: Dict) -> Dict:
+        yes = self.random.random() < profile.get("yes_rate", self.yes_rate)
+        return {
+            "vote": "YES" if yes else "NO",
+            "risk_score": self.random.randint(2, 5) if yes else self.random.randint(5, 9),
+            "reasoning": "Simulated reasoning from the offline benchmark backend.",
+            "conditions": ""
+        }
+
+    def _output(self, model: str, prompt: str) -> str:
+        profile = self._profile(model)
+        if "output" in profile:
+            return profile["output"]
+        if "Available actions" in prompt:
+            return json.dumps({
+                "reasoning": "Simulated plan from the offline benchmark backend.",
+                "actions": [
+                    {
+                        "type": "REQUEST_PURCHASE",
+                        "amount": self.random.choice([100, 250, 500]),
+                        "purpose": f"Simulated purchase {i + 1}",
+                        "justification": "Needed for the goal",
+                        "expected_roi": "Positive"
+                    }
+                    for i in range(3)
+                ]
+            })
+        request_ids = _REQUEST_ID.findall(prompt)
+        if request_ids:
+            return json.dumps([dict(self._vote(profile), request_id=r) for r in request_ids])
+        return json.dumps(self._vote(profile))
+
+    def _maybe_fail(self, model: str):
+        if self.random.random() < self._profile(model).get("error_rate", self.error_rate):
+            raise FakeProviderError(f"Simulated provider error from {model}")
+
+    def run(self, input: str = None, model: str = None, stream: bool = False, **kwargs):
+        self.calls += 1
+        if stream:
+            return self._stream(input or "", model)
+        return self._run(input or "", model)
+
+    async def _run(self, prompt: str, model: str) -> _RunResult:
+        await asyncio.sleep(self._latency(model))
+        self._maybe_fail(model)
+        return _RunResult(self._output(model, prompt))
+
+    async def _stream(self, prompt: str, model: str):
+        text = self._output(model, prompt)
+        pieces = [text[i:i + 8] for i in range(0, len(text), 8)] or [""]
+        delay = self._latency(model) / len(pieces)
+        for index, piece in enumerate(pieces):
+            await asyncio.sleep(delay)
+            if index == 0:
+                self._maybe_fail(model)
+            yield _Chunk(piece)
+
+
+class FakeDedalus:
+    """
+    Placeholder client for code that only needs a client object; pair it with
+    FakeDedalusRunner (AgentConsensusSystem(client=FakeDedalus(), runner=...)).
+    """
+
+    async def close(self):
+        pass
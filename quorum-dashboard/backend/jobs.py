@@ -0,0 +1,134 @@
+import asyncio
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from event_loop import background_loop
+
+
+class JobQueueFull(Exception):
+    """
+    Raised by JobManager.submit when max_jobs jobs are still unfinished.
+    """
+
+
+class SimulationJob:
+    """
+    A queued/running/finished simulation and its partial progress.
+    """
+
+    def __init__(self, agent_name: str, goal: str, budget: int):
+        self.job_id = uuid.uuid4().hex
+        self.agent_name = agent_name
+        self.goal = goal
+        self.budget = budget
+        self.status = 'queued'
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.actions_taken = []
+        self.result = None
+        self.error = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('completed', 'failed')
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        data = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "agent_name": self.agent_name,
+            "goal": self.goal,
+            "budget": self.budget,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "actions_completed": len(self.actions_taken),
+            "error": self.error
+        }
+        if include_result:
+            data["actions_taken"] = list(self.actions_taken)
+            data["result"] = self.result
+        return data
+
+
+class JobManager:
+    """
+    Runs simulations in the background on the shared event loop.
+
+    At most max_workers simulations run at once; the rest wait in the queue.
+    Only the newest max_jobs jobs are kept, finished jobs are dropped first;
+    once max_jobs jobs are all unfinished, submit refuses new ones.
+    """
+
+    def __init__(self, max_workers: int = 4, max_jobs: int = 500):
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self.jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._semaphore = None
+
+    def submit(self, agent_name: str, goal: str, budget: int,
+               run: Callable, on_complete: Optional[Callable] = None) -> SimulationJob:
+        """
+        Queue a simulation. `run(job)` must return the coroutine to execute; it
+        can append progress to job.actions_taken as actions finish.
+        `on_complete(result)` (e.g. storing the result) runs in a worker
+        thread, off the event loop, before the job reports completed.
+        Raises JobQueueFull when max_jobs jobs are queued or running.
+        """
+        job = SimulationJob(agent_name, goal, budget)
+        with self._lock:
+            unfinished = sum(1 for j in self.jobs.values() if not j.finished)
+            if unfinished >= self.max_jobs:
+                raise JobQueueFull(f"{unfinished} simulations are already queued or running")
+            self.jobs[job.job_id] = job
+            self._evict()
+        background_loop.submit(self._run(job, run, on_complete))
+        return job
+
+    async def _run(self, job: SimulationJob, run: Callable, on_complete: Optional[Callable]):
+        # Created on first use so it belongs to the background loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+
+        async with self._semaphore:
+            job.status = 'running'
+            job.started_at = time.time()
+            try:
+                job.result = await run(job)
+                if on_complete is not None:
+                    await asyncio.get_running_loop().run_in_executor(None, on_complete, job.result)
+                job.status = 'completed'
+            except Exception as e:
+                print(f"Error in simulation job {job.job_id}: {e}")
+                traceback.print_exc()
+                job.error = str(e)
+                job.status = 'failed'
+            finally:
+                job.finished_at = time.time()
+
+    def _evict(self):
+        overflow = len(self.jobs) - self.max_jobs
+        if overflow <= 0:
+            return
+        for job_id in [j.job_id for j in self.jobs.values() if j.finished][:overflow]:
+            del self.jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[SimulationJob]:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def list(self) -> List[SimulationJob]:
+        with self._lock:
+            return list(self.jobs.values())
+
+    def stats(self) -> Dict:
+        counts = {"queued": 0, "running": 0, "completed": 0, "failed": 0}
+        for job in self.list():
+            counts[job.status] += 1
+        return counts
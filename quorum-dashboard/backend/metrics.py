@@ -0,0 +1,188 @@
+import bisect
+import threading
+from typing import Dict, List, Tuple
+
+# Latency buckets (seconds) sized for LLM calls
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 45, 60, 90)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(str(labels.get(name, '')) for name in self.labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key: Tuple, value) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labels, key)} {value}"]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0, 0.0]
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                state[0][index] += 1
+            state[1] += 1
+            state[2] += value
+
+    def _render_value(self, key: Tuple, value) -> List[str]:
+        bucket_counts, count, total = value
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, bucket_counts):
+            cumulative += bucket_count
+            bucket_labels = _format_labels(self.labels, key, 'le="%s"' % bound)
+            lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+        bucket_labels = _format_labels(self.labels, key, 'le="+Inf"')
+        lines.append(f"{self.name}_bucket{bucket_labels} {count}")
+        lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {total}")
+        lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class Registry:
+    """
+    Holds metrics and renders them in the Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+# Consensus path instrumentation
+AGENT_LATENCY = REGISTRY.histogram(
+    'quorum_agent_vote_latency_seconds', 'Time to get one agent vote', ('agent', 'model', 'source')
+)
+AGENT_VOTES = REGISTRY.counter(
+    'quorum_agent_votes_total', 'Agent votes by outcome and source (primary/hedge/timeout/error)',
+    ('agent', 'vote', 'source')
+)
+PARSE_FAILURES = REGISTRY.counter(
+    'quorum_vote_parse_failures_total', 'Agent answers without an unambiguous vote', ('agent', 'model')
+)
+MODEL_CALLS = REGISTRY.counter(
+    'quorum_model_calls_total', 'LLM calls by model and outcome', ('model', 'outcome')
+)
+TOKENS = REGISTRY.counter(
+    'quorum_estimated_tokens_total', 'Estimated tokens (4 chars per token) sent and received',
+    ('model', 'direction')
+)
+AGENTS_SKIPPED = REGISTRY.counter(
+    'quorum_agents_skipped_total', 'Deferred agents never asked because the outcome was settled', ('agent',)
+)
+COALESCED = REGISTRY.counter(
+    'quorum_coalesced_evaluations_total', 'Evaluations that joined an identical in-flight evaluation'
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    'quorum_provider_queue_depth', 'Provider calls waiting for admission', ('provider', 'urgency')
+)
+QUEUE_WAIT = REGISTRY.histogram(
+    'quorum_provider_queue_wait_seconds', 'Time a provider call waited for admission', ('provider', 'urgency')
+)
+PROVIDER_IN_FLIGHT = REGISTRY.gauge(
+    'quorum_provider_in_flight', 'Provider calls currently admitted', ('provider',)
+)
+DECISION_LATENCY = REGISTRY.histogram(
+    'quorum_decision_latency_seconds', 'End-to-end evaluate_purchase latency', ('decided_by',)
+)
+DECISIONS = REGISTRY.counter(
+    'quorum_decisions_total', 'Decisions by outcome and what decided them', ('decided_by', 'approved')
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text or '') + 3) // 4
@@ -1,9 +1,134 @@
 # Agent that has access to your consensus system as a TOOL
+import argparse
 import asyncio
+import inspect
 import json
-from typing import Dict
-from dedalus_labs import AsyncDedalus, DedalusRunner
-from concensus import AgentConsensusSystem
+import os
+import re
+import time
+from typing import Callable, Dict, Iterable, Iterator, List
+from concensus import AgentConsensusSystem, _chunk_text
+from dedalus_pool import close_client
+
+class BudgetLedger:
+    """
+    Async budget ledger for one task run. Each action reserves its amount
+    before going to consensus; the reservation is committed on approval and
+    released on denial, so concurrent approvals can never overspend.
+    An action that only fails to fit next to outstanding reservations waits
+    for them to settle, so whether it is denied depends on the budget, not on
+    timing. Create it inside the running loop.
+    """
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.spent = 0
+        self.reserved = 0
+        self._settled = asyncio.Condition()
+
+    @property
+    def available(self) -> float:
+        return self.budget - self.spent - self.reserved
+
+    async def reserve(self, amount: float):
+        """
+        Reserve amount, waiting while it only fits once outstanding
+        reservations are released. Returns the budget available before the
+        reservation, or None when the amount exceeds what is left unspent.
+        """
+        async with self._settled:
+            await self._settled.wait_for(
+                lambda: amount <= self.available or amount > self.budget - self.spent
+            )
+            if amount > self.budget - self.spent:
+                return None
+            available = self.available
+            self.reserved += amount
+            return available
+
+    async def commit(self, amount: float):
+        async with self._settled:
+            self.reserved -= amount
+            self.spent += amount
+            self._settled.notify_all()
+
+    async def release(self, amount: float):
+        async with self._settled:
+            self.reserved -= amount
+            self._settled.notify_all()
+
+
+class IncrementalActionParser:
+    """
+    Scans a streamed plan and returns each object of its "actions" array as
+    soon as the object's closing brace arrives, so it can go to consensus
+    while the planner is still writing the rest of the plan.
+    """
+
+    _ACTIONS_KEY = re.compile(r'"actions"\s*:\s*\[')
+
+    def __init__(self):
+        self._text = ''
+        self._pos = None  # scan position once inside the actions array
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._start = None
+        self.done = False
+        self.actions = []
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """
+        Add streamed text; returns the actions completed by it.
+        """
+        self._text += chunk
+        if self.done:
+            return []
+        if self._pos is None:
+            match = self._ACTIONS_KEY.search(self._text)
+            if match is None:
+                return []
+            self._pos = match.end()
+
+        completed = []
+        text = self._text
+        while self._pos < len(text):
+            char = text[self._pos]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == '{':
+                if self._depth == 0:
+                    self._start = self._pos
+                self._depth += 1
+            elif char == '}':
+                self._depth -= 1
+                if self._depth == 0 and self._start is not None:
+                    try:
+                        action = json.loads(text[self._start:self._pos + 1])
+                    except ValueError:
+                        action = None
+                    if isinstance(action, dict):
+                        completed.append(action)
+                    self._start = None
+            elif char == ']' and self._depth == 0:
+                self.done = True
+                self._pos += 1
+                break
+            self._pos += 1
+        self.actions.extend(completed)
+        return completed
+
+    @property
+    def text(self) -> str:
+        return self._text
+
 
 class AutonomousTaskAgent:
     """
@@ -11,18 +136,20 @@ class AutonomousTaskAgent:
     payment system when it needs to make purchases.
     """
     
-    def __init__(self, agent_name: str, goal: str, budget: int):
-        self.client = AsyncDedalus()
+    def __init__(self, agent_name: str, goal: str, budget: int,
+                 consensus_system: AgentConsensusSystem = None):
         self.agent_name = agent_name
         self.goal = goal
         self.budget = budget
-        self.consensus_system = AgentConsensusSystem()
+        # Agents share one consensus system (and the pooled client) when given
+        self.consensus_system = consensus_system or AgentConsensusSystem()
 
     
-    async def complete_task(self):
+    async def complete_task(self, on_action: Callable[[Dict], None] = None):
         """
         Agent attempts to complete its goal.
         It will autonomously decide when it needs to make purchases.
+        on_action, if given, is called with each action result as it finishes.
         """
         
         task_prompt = f"""
@@ -68,37 +195,124 @@ class AutonomousTaskAgent:
     }}
     """
         
-        runner = DedalusRunner(self.client)
-        response = await runner.run(
-            input=task_prompt,
-            model="openai/gpt-4.1"
-        )
-        
-        # Parse agent's planned actions
-        parsed = self._parse_actions(response.final_output)
-        reasoning = parsed.get('reasoning', 'No reasoning provided')
-        actions = parsed.get('actions', [])
-        
-        # Execute each action through consensus
-        results = []
-        for action in actions:
+        started = time.perf_counter()
+        timings = {"first_action_ms": None, "first_approval_ms": None}
+        ledger = BudgetLedger(self.budget)
+
+        async def execute(action: Dict) -> Dict:
             if action['type'] == 'REQUEST_PURCHASE':
-                result = await self._request_purchase(action)
-                results.append(result)
-            elif action['type'] == 'HIRE_AGENT':
-                result = await self._hire_agent(action)
-                results.append(result)
+                result = await self._request_purchase(action, ledger)
+            else:
+                result = await self._hire_agent(action, ledger)
+            if result['approved'] and timings['first_approval_ms'] is None:
+                timings['first_approval_ms'] = round((time.perf_counter() - started) * 1000, 1)
+            if on_action is not None:
+                on_action(result)
+            return result
+
+        # Each action goes to consensus (against the shared ledger) as soon as
+        # the planner has finished writing it, while the rest is still streaming
+        tasks = []
+
+        def start(action: Dict):
+            if action.get('type') not in ('REQUEST_PURCHASE', 'HIRE_AGENT'):
+                return
+            if timings['first_action_ms'] is None:
+                timings['first_action_ms'] = round((time.perf_counter() - started) * 1000, 1)
+            tasks.append(asyncio.ensure_future(execute(action)))
+
+        parser = IncrementalActionParser()
+        try:
+            async for text in self._stream_plan(task_prompt):
+                for action in parser.feed(text):
+                    start(action)
+        except Exception as e:
+            if not tasks:
+                raise
+            print(f"⚠️  {self.agent_name}: plan stream failed after {len(tasks)} action(s), "
+                  f"keeping those: {e!r}")
+        timings['plan_ms'] = round((time.perf_counter() - started) * 1000, 1)
+
+        # Parse agent's planned actions (the whole plan, for the reasoning and
+        # for plans the incremental parser could not follow)
+        parsed = self._parse_actions(parser.text)
+        reasoning = parsed.get('reasoning', 'No reasoning provided')
+        if not parser.actions:
+            for action in parsed.get('actions', []):
+                start(action)
+
+        try:
+            results = list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        timings['total_ms'] = round((time.perf_counter() - started) * 1000, 1)
         
         return {
             "agent": self.agent_name,
             "goal": self.goal,
             "reasoning": reasoning,
             "actions_taken": results,
-            "total_spent": sum(r['amount'] for r in results if r['approved']),
-            "budget_remaining": self.budget - sum(r['amount'] for r in results if r['approved'])
+            "total_spent": ledger.spent,
+            "budget_remaining": self.budget - ledger.spent,
+            "timings": timings
         }
 
-    async def _request_purchase(self, action: Dict) -> Dict:
+    async def _stream_plan(self, task_prompt: str):
+        """
+        Yield the planner's answer as it streams, using the same (pooled)
+        runner as the consensus system.
+        """
+        stream = self.consensus_system.runner.run(
+            input=task_prompt,
+            model="openai/gpt-4.1",
+            stream=True
+        )
+        if inspect.isawaitable(stream):
+            stream = await stream
+        try:
+            async for chunk in stream:
+                text = _chunk_text(chunk)
+                if text:
+                    yield text
+        finally:
+            aclose = getattr(stream, 'aclose', None)
+            if aclose is not None:
+                await aclose()
+
+    async def _evaluate_with_budget(self, purchase_request: Dict, ledger: BudgetLedger) -> Dict:
+        """
+        Reserve the amount, send the request to consensus with the real remaining
+        budget, then commit or release the reservation.
+        """
+        amount = purchase_request['amount']
+        available = await ledger.reserve(amount)
+        if available is None:
+            left = ledger.budget - ledger.spent
+            print(f"💸 {self.agent_name}: ${amount} for {purchase_request['purpose']} exceeds "
+                  f"the ${left} left, not sent to consensus")
+            return {
+                "approved": False,
+                "decided_by": "budget",
+                "reason": f"Insufficient budget: ${left} available",
+                "purchase_request": purchase_request
+            }
+
+        purchase_request['budget_remaining'] = available
+        try:
+            result = await self.consensus_system.evaluate_purchase(purchase_request)
+        except BaseException:
+            await ledger.release(amount)
+            raise
+
+        if result['approved']:
+            await ledger.commit(amount)
+        else:
+            await ledger.release(amount)
+        return result
+
+    async def _request_purchase(self, action: Dict, ledger: BudgetLedger) -> Dict:
         """
         Submit purchase request to consensus system
         """
@@ -109,10 +323,10 @@ class AutonomousTaskAgent:
             "justification": action['justification'],
             "expected_roi": action['expected_roi'],
             "urgency": action.get('urgency', 'Medium'),
-            "budget_remaining": self.budget
+            "budget_remaining": ledger.available
         }
         
-        result = await self.consensus_system.evaluate_purchase(purchase_request)
+        result = await self._evaluate_with_budget(purchase_request, ledger)
         
         return {
             "type": "purchase",
@@ -122,7 +336,7 @@ class AutonomousTaskAgent:
             "votes": result
         }
     
-    async def _hire_agent(self, action: Dict) -> Dict:
+    async def _hire_agent(self, action: Dict, ledger: BudgetLedger) -> Dict:
         """
         Hire another agent (also goes through consensus)
         """
@@ -133,10 +347,10 @@ class AutonomousTaskAgent:
             "justification": action['justification'],
             "expected_roi": action['expected_roi'],
             "urgency": "Medium",
-            "budget_remaining": self.budget
+            "budget_remaining": ledger.available
         }
         
-        result = await self.consensus_system.evaluate_purchase(purchase_request)
+        result = await self._evaluate_with_budget(purchase_request, ledger)
         
         return {
             "type": "agent_hire",
@@ -167,71 +381,237 @@ class AutonomousTaskAgent:
         }
 
 
-async def run_simulation():
-    """
-    Run multiple autonomous agents trying to complete different goals.
-    They all use the payment system autonomously.
-    """
-    
+# Used when run_simulation is not given any specs
+DEFAULT_AGENT_SPECS = [
     # Scenario 1: Marketing Agent launching new campaign
-    marketing_agent = AutonomousTaskAgent(
-        agent_name="Marketing Agent Alpha",
-        goal="Launch a new product landing page and ad campaign to acquire 1000 users",
-        budget=5000
-    )
-    
+    {
+        "agent_name": "Marketing Agent Alpha",
+        "goal": "Launch a new product landing page and ad campaign to acquire 1000 users",
+        "budget": 5000
+    },
     # Scenario 2: Product Agent building new feature
-    product_agent = AutonomousTaskAgent(
-        agent_name="Product Agent Beta",
-        goal="Build and deploy an AI-powered search feature for our app",
-        budget=3000
-    )
-    
+    {
+        "agent_name": "Product Agent Beta",
+        "goal": "Build and deploy an AI-powered search feature for our app",
+        "budget": 3000
+    },
     # Scenario 3: Customer Success Agent improving support
-    cs_agent = AutonomousTaskAgent(
-        agent_name="Customer Success Agent Gamma",
-        goal="Reduce support ticket response time from 4 hours to under 1 hour",
-        budget=2000
-    )
-    
+    {
+        "agent_name": "Customer Success Agent Gamma",
+        "goal": "Reduce support ticket response time from 4 hours to under 1 hour",
+        "budget": 2000
+    }
+]
+
+
+def load_agent_specs(path: str) -> Iterator[Dict]:
+    """
+    Yield {agent_name, goal, budget[, id]} specs from a JSON array file or a
+    JSONL file (one spec per line, read lazily so huge files stay cheap).
+    """
+    with open(path) as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        if first == '[':
+            yield from json.load(f)
+            return
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _completed_spec_ids(output_path: str) -> set:
+    """
+    spec_ids already written successfully to a previous run's JSONL output.
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A line cut off by the interruption
+                continue
+            if 'error' not in record:
+                done.add(record.get('spec_id'))
+    return done
+
+
+class SimulationStats:
+    """
+    Running totals for a simulation, kept in constant memory.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.agents_completed = 0
+        self.agents_failed = 0
+        self.agents_skipped = 0
+        self.actions = 0
+        self.approved = 0
+        self.denied = 0
+        self.total_spent = 0
+        self.total_budget = 0
+
+    def add(self, result: Dict):
+        self.agents_completed += 1
+        self.actions += len(result['actions_taken'])
+        approved = sum(1 for a in result['actions_taken'] if a['approved'])
+        self.approved += approved
+        self.denied += len(result['actions_taken']) - approved
+        self.total_spent += result['total_spent']
+        self.total_budget += result['total_spent'] + result['budget_remaining']
+
+    def to_dict(self) -> Dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "agents_completed": self.agents_completed,
+            "agents_failed": self.agents_failed,
+            "agents_skipped": self.agents_skipped,
+            "actions": self.actions,
+            "approved": self.approved,
+            "denied": self.denied,
+            "approval_rate": round(self.approved / self.actions, 3) if self.actions else 0,
+            "total_spent": self.total_spent,
+            "budget_used": round(self.total_spent / self.total_budget, 3) if self.total_budget else 0,
+            "elapsed_s": round(elapsed, 1),
+            "agents_per_s": round(self.agents_completed / elapsed, 2) if elapsed else 0
+        }
+
+
+async def run_simulation(specs: Iterable[Dict] = None, output_path: str = None,
+                         concurrency: int = 8, resume: bool = False, progress_every: float = 5.0,
+                         consensus_system: AgentConsensusSystem = None) -> Dict:
+    """
+    Run autonomous agents trying to complete different goals.
+    They all use the payment system autonomously.
+
+    specs (default: three built-in agents) is consumed lazily by `concurrency`
+    workers sharing one consensus system. With output_path, each finished
+    agent is appended to it as one JSON line and flushed right away, so an
+    interrupted run keeps everything completed so far; resume skips the specs
+    already written. Progress is printed every progress_every seconds.
+    Returns the aggregate statistics (plus the results when there is no
+    output_path to stream them to).
+    """
+    if specs is None:
+        specs = DEFAULT_AGENT_SPECS
+    owns_system = consensus_system is None
+    consensus_system = consensus_system or AgentConsensusSystem()
+
+    stats = SimulationStats()
+    done = _completed_spec_ids(output_path) if output_path and resume else set()
+    output = open(output_path, 'a' if resume else 'w') if output_path else None
+    if output is not None and output.tell() > 0:
+        with open(output_path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                # Terminate the line the interruption cut off
+                output.write("\n")
+    results = [] if output is None else None
+    spec_iterator = iter(enumerate(specs))
+
     print("\n" + "="*60)
     print("🤖 AUTONOMOUS AGENT SIMULATION")
     print("="*60)
-    print("\nThree agents are attempting to complete their goals...")
+    print(f"\nAgents are attempting to complete their goals ({concurrency} at a time)...")
     print("They will autonomously request purchases and hire other agents.")
     print("All requests go through 5-agent consensus approval.\n")
-    
-    # Run all agents in parallel
-    results = await asyncio.gather(
-        marketing_agent.complete_task(),
-        product_agent.complete_task(),
-        cs_agent.complete_task()
-    )
-    
+    if done:
+        print(f"↩️  Resuming: {len(done)} agent(s) already completed in {output_path}")
+
+    def write(record: Dict):
+        if output is not None:
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+        elif 'error' not in record:
+            results.append(record)
+
+    async def worker():
+        for index, spec in spec_iterator:
+            spec_id = spec.get('id', index)
+            if spec_id in done:
+                stats.agents_skipped += 1
+                continue
+            agent = AutonomousTaskAgent(
+                agent_name=spec['agent_name'],
+                goal=spec['goal'],
+                budget=spec['budget'],
+                consensus_system=consensus_system
+            )
+            try:
+                result = await agent.complete_task()
+            except Exception as e:
+                print(f"❌ {spec['agent_name']} failed: {e!r}")
+                stats.agents_failed += 1
+                write({"spec_id": spec_id, "agent": spec['agent_name'], "error": f"{type(e).__name__}: {e}"})
+                continue
+            stats.add(result)
+            write(dict(result, spec_id=spec_id))
+
+    async def report_progress():
+        while True:
+            await asyncio.sleep(progress_every)
+            progress = stats.to_dict()
+            print(f"📈 {progress['agents_completed']} done, {progress['agents_failed']} failed, "
+                  f"{progress['approved']}/{progress['actions']} actions approved, "
+                  f"${progress['total_spent']} spent, {progress['agents_per_s']} agents/s")
+
+    reporter = asyncio.ensure_future(report_progress()) if progress_every else None
+    try:
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+        if output is not None:
+            output.close()
+        if owns_system:
+            await close_client()
+
     # Print summary
+    summary = stats.to_dict()
     print("\n" + "="*60)
     print("📊 SIMULATION COMPLETE")
     print("="*60)
-    
-    for result in results:
-        print(f"\n{result['agent']}:")
-        print(f"  Goal: {result['goal']}")
-        print(f"  Actions Taken: {len(result['actions_taken'])}")
-        print(f"  Total Spent: ${result['total_spent']}")
-        print(f"  Budget Remaining: ${result['budget_remaining']}")
-        
-        approved = sum(1 for a in result['actions_taken'] if a['approved'])
-        denied = len(result['actions_taken']) - approved
-        print(f"  Approved: {approved}, Denied: {denied}")
-    
-    return results
+    for key, value in summary.items():
+        print(f"  {key.replace('_', ' ').capitalize()}: {value}")
+
+    if results is not None:
+        for result in results:
+            print(f"\n{result['agent']}:")
+            print(f"  Goal: {result['goal']}")
+            print(f"  Actions Taken: {len(result['actions_taken'])}")
+            print(f"  Total Spent: ${result['total_spent']}")
+            print(f"  Budget Remaining: ${result['budget_remaining']}")
+
+            approved = sum(1 for a in result['actions_taken'] if a['approved'])
+            denied = len(result['actions_taken']) - approved
+            print(f"  Approved: {approved}, Denied: {denied}")
+        summary['results'] = results
+
+    return summary
 
 
 if __name__ == "__main__":
-    results = asyncio.run(run_simulation())
-    
-    # Save full results
-    with open('simulation_results.json', 'w') as f:
-        json.dump(results, f, indent=2)
-    
-    print("\n💾 Full results saved to simulation_results.json")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run autonomous agents through the consensus payment system")
+    parser.add_argument('--specs', help='JSON array or JSONL file of {agent_name, goal, budget} specs')
+    parser.add_argument('--output', default='simulation_results.jsonl', help='JSONL file, one line per agent')
+    parser.add_argument('--concurrency', type=int, default=8, help='agents running at once')
+    parser.add_argument('--resume', action='store_true', help='skip agents already in --output')
+    parser.add_argument('--progress-every', type=float, default=5.0, help='seconds between progress lines')
+    args = parser.parse_args()
+
+    summary = asyncio.run(run_simulation(
+        specs=load_agent_specs(args.specs) if args.specs else None,
+        output_path=args.output,
+        concurrency=args.concurrency,
+        resume=args.resume,
+        progress_every=args.progress_every
+    ))
+
+    print(f"\n💾 Results streamed to {args.output}")
@@ -0,0 +1,109 @@
+import json
+import os
+from typing import Dict, List, Optional
+
+APPROVE = 'approve'
+DENY = 'deny'
+ESCALATE = 'escalate'
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class PolicyRule:
+    """
+    A deterministic rule: when all of its conditions match a purchase request,
+    it approves, denies, or escalates the request to the LLM quorum.
+
+    Supported conditions ("when"):
+      amount_exceeds_budget: true  - amount > budget_remaining
+      min_amount / max_amount      - inclusive amount bounds
+      requesting_agents            - allow-list of requesting agent names
+      purpose_keywords             - any keyword appears in the purpose (case-insensitive)
+      urgency                      - list of urgency levels
+    """
+
+    CONDITIONS = ('amount_exceeds_budget', 'min_amount', 'max_amount',
+                  'requesting_agents', 'purpose_keywords', 'urgency')
+
+    def __init__(self, name: str, action: str, when: Dict, reason: str = ''):
+        if action not in (APPROVE, DENY, ESCALATE):
+            raise ValueError(f"Policy rule {name!r}: unknown action {action!r}")
+        unknown = set(when) - set(self.CONDITIONS)
+        if unknown:
+            raise ValueError(f"Policy rule {name!r}: unknown conditions {sorted(unknown)}")
+        self.name = name
+        self.action = action
+        self.when = when
+        self.reason = reason or name
+
+    def matches(self, purchase_request: Dict) -> bool:
+        when = self.when
+        amount = _to_float(purchase_request.get('amount'))
+
+        if 'amount_exceeds_budget' in when:
+            budget = _to_float(purchase_request.get('budget_remaining'))
+            exceeds = amount is not None and budget is not None and amount > budget
+            if exceeds != bool(when['amount_exceeds_budget']):
+                return False
+        if 'min_amount' in when and (amount is None or amount < when['min_amount']):
+            return False
+        if 'max_amount' in when and (amount is None or amount > when['max_amount']):
+            return False
+        if 'requesting_agents' in when and purchase_request.get('requesting_agent') not in when['requesting_agents']:
+            return False
+        if 'purpose_keywords' in when:
+            purpose = str(purchase_request.get('purpose') or '').lower()
+            if not any(keyword.lower() in purpose for keyword in when['purpose_keywords']):
+                return False
+        if 'urgency' in when and purchase_request.get('urgency', 'Medium') not in when['urgency']:
+            return False
+        return True
+
+
+class PolicyEngine:
+    """
+    Ordered rule list evaluated before the quorum; the first matching rule wins.
+    Requests matching no rule (or an 'escalate' rule) go to the quorum.
+    """
+
+    def __init__(self, rules: List[PolicyRule]):
+        self.rules = rules
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'PolicyEngine':
+        return cls([
+            PolicyRule(rule['name'], rule['action'], rule.get('when', {}), rule.get('reason', ''))
+            for rule in config.get('rules', [])
+        ])
+
+    @classmethod
+    def from_file(cls, path: str) -> 'PolicyEngine':
+        with open(path) as f:
+            return cls.from_config(json.load(f))
+
+    def evaluate(self, purchase_request: Dict) -> Optional[PolicyRule]:
+        """
+        The first matching rule, or None when no rule matches.
+        """
+        for rule in self.rules:
+            if rule.matches(purchase_request):
+                return rule
+        return None
+
+
+def load_policy(path: str = None) -> Optional[PolicyEngine]:
+    """
+    Load the policy from QUORUM_POLICY_PATH (default: policy_rules.json next to
+    this file). Returns None when the file does not exist or the path is 'none'.
+    """
+    path = path or os.getenv(
+        'QUORUM_POLICY_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'policy_rules.json')
+    )
+    if path.lower() == 'none' or not os.path.exists(path):
+        return None
+    return PolicyEngine.from_file(path)
@@ -0,0 +1,196 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Dict
+
+from dedalus_labs import APIConnectionError, APIStatusError, APITimeoutError
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits and server errors
+TRANSIENT_STATUSES = (408, 409, 429)
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling a provider whose circuit is open.
+    """
+
+    def __init__(self, provider: str):
+        super().__init__(f"Circuit open for provider {provider}")
+        self.provider = provider
+
+
+def provider_of(model: str) -> str:
+    return (model or '').split('/', 1)[0]
+
+
+def is_transient(error: Exception) -> bool:
+    """
+    Connection problems, timeouts, rate limits and 5xx answers; not bad
+    requests or auth errors, which a retry cannot fix.
+    """
+    if isinstance(error, (APIConnectionError, APITimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, 'status_code', None)
+    if isinstance(error, APIStatusError) or status is not None:
+        return status in TRANSIENT_STATUSES or (status or 0) >= 500
+    return False
+
+
+class CircuitBreaker:
+    """
+    Trips open after failure_threshold consecutive transient failures. Once
+    reset_timeout has passed, one trial call is let through (half open): its
+    success closes the circuit, its failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.last_error = None
+
+    def available(self, now: float) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            return now - self.opened_at >= self.reset_timeout
+        return not self.trial_in_flight
+
+    def allow(self, now: float) -> bool:
+        if self.state == OPEN and now - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            self.trial_in_flight = False
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.trial_in_flight = False
+
+    def record_failure(self, error: Exception, now: float):
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = f"{type(error).__name__}: {error}"[:200]
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = now
+        self.trial_in_flight = False
+
+    def release(self):
+        # A call ended without telling us anything (cancelled, or a non-transient error)
+        self.trial_in_flight = False
+
+    def to_dict(self, now: float) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "successes": self.successes,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "last_error": self.last_error,
+            "retry_in_s": round(max(0.0, self.reset_timeout - (now - self.opened_at)), 1)
+            if self.state == OPEN else None
+        }
+
+
+class ProviderHealth:
+    """
+    Per-provider (model prefix, e.g. 'xai') circuit breakers plus the retry
+    policy for transient failures: up to max_retries retries with exponential
+    backoff (base_delay * 2^attempt, capped at max_delay, with jitter).
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30,
+                 max_retries: int = 2, base_delay: float = 0.5, max_delay: float = 4.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def _breaker(self, model: str) -> CircuitBreaker:
+        provider = provider_of(model)
+        breaker = self._breakers.get(provider)
+        if breaker is None:
+            breaker = self._breakers[provider] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return breaker
+
+    def available(self, model: str) -> bool:
+        """
+        Whether a call to model would currently be let through (no side effects).
+        """
+        with self._lock:
+            return self._breaker(model).available(time.monotonic())
+
+    def allow(self, model: str) -> bool:
+        with self._lock:
+            return self._breaker(model).allow(time.monotonic())
+
+    def record_success(self, model: str):
+        with self._lock:
+            self._breaker(model).record_success()
+
+    def record_failure(self, model: str, error: Exception):
+        with self._lock:
+            breaker = self._breaker(model)
+            was_open = breaker.state == OPEN
+            breaker.record_failure(error, time.monotonic())
+            tripped = breaker.state == OPEN and not was_open
+        if tripped:
+            print(f"🚧 Circuit open for {provider_of(model)} after {breaker.consecutive_failures} "
+                  f"failure(s), retrying in {self.reset_timeout}s")
+
+    def record_rejection(self, model: str):
+        with self._lock:
+            self._breaker(model).rejected += 1
+
+    def release(self, model: str):
+        with self._lock:
+            self._breaker(model).release()
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        with self._lock:
+            return {provider: breaker.to_dict(now) for provider, breaker in sorted(self._breakers.items())}
+
+
+def create_provider_health() -> ProviderHealth:
+    """
+    ProviderHealth configured from the environment.
+    """
+    return ProviderHealth(
+        failure_threshold=int(os.getenv('QUORUM_BREAKER_FAILURES', '5')),
+        reset_timeout=float(os.getenv('QUORUM_BREAKER_RESET', '30')),
+        max_retries=int(os.getenv('QUORUM_RETRIES', '2')),
+        base_delay=float(os.getenv('QUORUM_RETRY_BASE_DELAY', '0.5')),
+        max_delay=float(os.getenv('QUORUM_RETRY_MAX_DELAY', '4'))
+    )
+
+
+# Shared by every consensus system in the process, like the pooled client
+provider_health = create_provider_health()
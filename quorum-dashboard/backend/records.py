@@ -0,0 +1,218 @@
+import sys
+import threading
+from typing import Dict, List, Optional
+
+# Order of the fields in a compact vote (a JSON array instead of an object)
+VOTE_FIELDS = ('agent_id', 'vote', 'risk_score', 'reasoning', 'conditions', 'source', 'latency_ms')
+
+# Keys of an evaluate_purchase result that DecisionRecord stores in slots;
+# anything else (decided_by, cached, early_exit, ...) is kept as extra
+_DECISION_KEYS = ('decision_id', 'approved', 'yes_votes', 'no_votes', 'abstain_votes',
+                  'average_risk_score', 'agent_votes', 'purchase_request')
+
+
+class AgentRoster:
+    """
+    Interned agent metadata. Each (name, emoji, model) seen in a vote gets a
+    small id, so stored votes reference the roster instead of repeating the
+    strings. Ids are only stable within one process; persisted and verbose
+    payloads always carry the full strings.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._agents = []
+        self._lock = threading.Lock()
+
+    def intern(self, name: str, emoji: str, model: str) -> int:
+        key = (name, emoji, model)
+        agent_id = self._ids.get(key)
+        if agent_id is None:
+            with self._lock:
+                agent_id = self._ids.get(key)
+                if agent_id is None:
+                    agent_id = len(self._agents)
+                    self._agents.append(tuple(sys.intern(str(part or '')) for part in key))
+                    self._ids[key] = agent_id
+        return agent_id
+
+    def get(self, agent_id: int):
+        return self._agents[agent_id]
+
+    def to_list(self) -> List[Dict]:
+        with self._lock:
+            agents = list(self._agents)
+        return [
+            {"id": agent_id, "agent_name": name, "emoji": emoji, "model": model}
+            for agent_id, (name, emoji, model) in enumerate(agents)
+        ]
+
+
+ROSTER = AgentRoster()
+
+
+class VoteRecord:
+    """
+    One agent vote, referencing its agent by roster id.
+    """
+    __slots__ = VOTE_FIELDS
+
+    def __init__(self, agent_id: int, vote: str, risk_score, reasoning: str,
+                 conditions: str = '', source: Optional[str] = None, latency_ms: Optional[float] = None):
+        self.agent_id = agent_id
+        self.vote = sys.intern(vote)
+        self.risk_score = risk_score
+        self.reasoning = reasoning
+        self.conditions = conditions
+        self.source = sys.intern(source) if source else None
+        self.latency_ms = latency_ms
+
+    @classmethod
+    def from_dict(cls, vote: Dict, roster: AgentRoster = ROSTER) -> 'VoteRecord':
+        return cls(
+            roster.intern(vote.get('agent_name'), vote.get('emoji'), vote.get('model')),
+            vote.get('vote', 'ABSTAIN'),
+            vote.get('risk_score', 0),
+            vote.get('reasoning', ''),
+            vote.get('conditions', ''),
+            vote.get('source'),
+            vote.get('latency_ms')
+        )
+
+    def to_dict(self, verbose: bool = True, roster: AgentRoster = ROSTER):
+        """
+        verbose: the vote dict evaluate_purchase returns.
+        compact: a list in VOTE_FIELDS order.
+        """
+        if not verbose:
+            return [getattr(self, field) for field in VOTE_FIELDS]
+        name, emoji, model = roster.get(self.agent_id)
+        vote = {
+            "agent_name": name,
+            "emoji": emoji,
+            "vote": self.vote,
+            "reasoning": self.reasoning,
+            "risk_score": self.risk_score,
+            "conditions": self.conditions,
+            "model": model
+        }
+        if self.source is not None:
+            vote['source'] = self.source
+        if self.latency_ms is not None:
+            vote['latency_ms'] = self.latency_ms
+        return vote
+
+
+class DecisionRecord:
+    """
+    A stored consensus decision. Vote counts are derived from the votes, so
+    only the votes, the request and any extra result keys are kept.
+    """
+    __slots__ = ('decision_id', 'approved', 'average_risk_score', 'votes', 'purchase_request', 'extra')
+
+    def __init__(self, decision_id: Optional[str], approved: bool, average_risk_score,
+                 votes: Optional[List[VoteRecord]], purchase_request: Optional[Dict], extra: Dict):
+        self.decision_id = decision_id
+        self.approved = approved
+        self.average_risk_score = average_risk_score
+        self.votes = votes
+        self.purchase_request = purchase_request
+        self.extra = extra
+
+    @classmethod
+    def from_result(cls, result: Dict, roster: AgentRoster = ROSTER) -> 'DecisionRecord':
+        """
+        Build from an evaluate_purchase result (or a verbose to_dict()).
+        Results without agent_votes (e.g. budget denials) keep votes=None.
+        """
+        agent_votes = result.get('agent_votes')
+        return cls(
+            result.get('decision_id'),
+            bool(result.get('approved')),
+            result.get('average_risk_score'),
+            None if agent_votes is None else [VoteRecord.from_dict(v, roster) for v in agent_votes],
+            result.get('purchase_request'),
+            {key: value for key, value in result.items() if key not in _DECISION_KEYS}
+        )
+
+    def _count(self, vote: str) -> int:
+        return sum(1 for v in self.votes if v.vote == vote)
+
+    def to_dict(self, verbose: bool = True, roster: AgentRoster = ROSTER) -> Dict:
+        """
+        verbose: the evaluate_purchase result shape (with vote counts).
+        compact: votes as VOTE_FIELDS arrays referencing the roster, no counts.
+        """
+        data = {"approved": self.approved}
+        if self.decision_id is not None:
+            data['decision_id'] = self.decision_id
+        if self.votes is not None:
+            if verbose:
+                data['yes_votes'] = self._count('YES')
+                data['no_votes'] = self._count('NO')
+                data['abstain_votes'] = self._count('ABSTAIN')
+            data['average_risk_score'] = self.average_risk_score
+            data['agent_votes'] = [vote.to_dict(verbose, roster) for vote in self.votes]
+        if self.purchase_request is not None:
+            data['purchase_request'] = self.purchase_request
+        data.update(self.extra)
+        return data
+
+
+class SimulationRecord:
+    """
+    A stored simulation result; each action's consensus result ('votes') is
+    kept as a DecisionRecord.
+    """
+    __slots__ = ('agent', 'goal', 'reasoning', 'actions', 'total_spent', 'budget_remaining', 'extra')
+
+    def __init__(self, agent: str, goal: str, reasoning: str, actions: List[Dict],
+                 total_spent, budget_remaining, extra: Dict):
+        self.agent = agent
+        self.goal = goal
+        self.reasoning = reasoning
+        self.actions = actions
+        self.total_spent = total_spent
+        self.budget_remaining = budget_remaining
+        self.extra = extra
+
+    @classmethod
+    def from_result(cls, result: Dict, roster: AgentRoster = ROSTER) -> 'SimulationRecord':
+        actions = []
+        for action in result.get('actions_taken', []):
+            action = dict(action)
+            if isinstance(action.get('votes'), dict):
+                action['votes'] = DecisionRecord.from_result(action['votes'], roster)
+            actions.append(action)
+        known = ('agent', 'goal', 'reasoning', 'actions_taken', 'total_spent', 'budget_remaining')
+        return cls(
+            result.get('agent'),
+            result.get('goal'),
+            result.get('reasoning'),
+            actions,
+            result.get('total_spent'),
+            result.get('budget_remaining'),
+            {key: value for key, value in result.items() if key not in known}
+        )
+
+    def to_dict(self, verbose: bool = True, roster: AgentRoster = ROSTER) -> Dict:
+        actions = []
+        for action in self.actions:
+            action = dict(action)
+            if isinstance(action.get('votes'), DecisionRecord):
+                votes = action['votes'].to_dict(verbose, roster)
+                if not verbose:
+                    # The action already names the amount and purpose
+                    votes.pop('purchase_request', None)
+                action['votes'] = votes
+            actions.append(action)
+        data = {
+            "agent": self.agent,
+            "goal": self.goal,
+            "reasoning": self.reasoning,
+            "actions_taken": actions,
+            "total_spent": self.total_spent,
+            "budget_remaining": self.budget_remaining
+        }
+        data.update(self.extra)
+        return data
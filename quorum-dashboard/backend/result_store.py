@@ -0,0 +1,169 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+
+class ResultStore:
+    """
+    Bounded store for evaluation/simulation results.
+
+    The newest max_recent items live in an in-memory ring buffer; every item
+    is also appended to a SQLite table (when a path is given) indexed on time,
+    requesting agent and approval, so memory stays flat while history survives
+    restarts. Listing is newest first with limit/offset pagination, and
+    ids increase monotonically so clients can ask only for what is new.
+
+    With a record_type (see records.py), items are kept in memory as slotted
+    records built with record_type.from_result and listed as records; SQLite
+    always holds the verbose JSON so it stays readable across restarts.
+    """
+
+    def __init__(self, table: str, path: Optional[str] = None, max_recent: int = 500,
+                 record_type=None):
+        self.table = table
+        self.path = path
+        self.record_type = record_type
+        self._recent = deque(maxlen=max_recent)  # (id, created_at, requesting_agent, approved, item)
+        self._count = 0
+        self.last_id = 0
+        self.revision = 0  # bumped by update(), so listings can tell an item changed
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " created_at REAL NOT NULL,"
+                " requesting_agent TEXT,"
+                " approved INTEGER,"
+                " payload TEXT NOT NULL)"
+            )
+            for column in ('created_at', 'requesting_agent', 'approved'):
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column})"
+                )
+            self._conn.commit()
+            self._count, last_id = self._conn.execute(f"SELECT COUNT(*), MAX(id) FROM {table}").fetchone()
+            self.last_id = last_id or 0
+
+            # Warm the ring buffer with the newest stored items
+            rows = self._conn.execute(
+                f"SELECT id, created_at, requesting_agent, approved, payload FROM {table}"
+                " ORDER BY id DESC LIMIT ?", (self._recent.maxlen,)
+            ).fetchall()
+            for item_id, created_at, requesting_agent, approved, payload in reversed(rows):
+                self._recent.append((
+                    item_id, created_at, requesting_agent,
+                    None if approved is None else bool(approved), self._load(payload)
+                ))
+
+    def _load(self, payload: str):
+        item = json.loads(payload)
+        return item if self.record_type is None else self.record_type.from_result(item)
+
+    def append(self, item: Dict, requesting_agent: str = None, approved: bool = None) -> int:
+        """
+        Store an item. Returns its id; ids only ever increase.
+        """
+        created_at = time.time()
+        record = item if self.record_type is None else self.record_type.from_result(item)
+        with self._lock:
+            if self._conn is not None:
+                cursor = self._conn.execute(
+                    f"INSERT INTO {self.table} (created_at, requesting_agent, approved, payload)"
+                    " VALUES (?, ?, ?, ?)",
+                    (created_at, requesting_agent, None if approved is None else int(approved), json.dumps(item))
+                )
+                self._conn.commit()
+                item_id = cursor.lastrowid
+            else:
+                item_id = self.last_id + 1
+            self.last_id = item_id
+            self._recent.append((item_id, created_at, requesting_agent, approved, record))
+            self._count += 1
+            return item_id
+
+    def update(self, item_id: int, item: Dict):
+        """
+        Replace a stored item (e.g. a decision whose late votes came in after
+        it was stored), in SQLite and in the ring buffer if it is still there.
+        """
+        record = item if self.record_type is None else self.record_type.from_result(item)
+        with self._lock:
+            if self._conn is not None:
+                self._conn.execute(
+                    f"UPDATE {self.table} SET payload = ? WHERE id = ?", (json.dumps(item), item_id)
+                )
+                self._conn.commit()
+            for index, entry in enumerate(self._recent):
+                if entry[0] == item_id:
+                    self._recent[index] = entry[:4] + (record,)
+                    break
+            self.revision += 1
+
+    def list(self, limit: int = 50, offset: int = 0, requesting_agent: str = None,
+             approved: bool = None, since: int = None) -> Dict:
+        """
+        Newest-first page of items plus their ids, the total matching count
+        and the cursor (the newest id stored). With since=<cursor>, only items
+        stored after that cursor are listed, oldest first, and the cursor is
+        the last id returned while has_more is set, so a client that keeps
+        passing the cursor back reads every item exactly once.
+        """
+        filtered = requesting_agent is not None or approved is not None
+        with self._lock:
+            # Everything after the cursor is still in the ring buffer
+            buffered_since = since is not None and (
+                len(self._recent) == self._count or since >= self._recent[0][0]
+            )
+            # Unfiltered pages inside the ring buffer never touch disk
+            if (self._conn is None or buffered_since
+                    or (not filtered and since is None and offset + limit <= len(self._recent))):
+                entries = self._recent if since is not None else reversed(self._recent)
+                matching = [
+                    entry for entry in entries
+                    if (since is None or entry[0] > since)
+                    and (requesting_agent is None or entry[2] == requesting_agent)
+                    and (approved is None or entry[3] == approved)
+                ]
+                total = len(matching) if filtered or since is not None or self._conn is None else self._count
+                page = matching[offset:offset + limit]
+                return self._page([entry[0] for entry in page], [entry[4] for entry in page],
+                                  total, offset, since)
+
+            where, params = [], []
+            if since is not None:
+                where.append("id > ?")
+                params.append(since)
+            if requesting_agent is not None:
+                where.append("requesting_agent = ?")
+                params.append(requesting_agent)
+            if approved is not None:
+                where.append("approved = ?")
+                params.append(int(approved))
+            clause = f" WHERE {' AND '.join(where)}" if where else ""
+
+            total = self._conn.execute(
+                f"SELECT COUNT(*) FROM {self.table}{clause}", params
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT id, payload FROM {self.table}{clause}"
+                f" ORDER BY id {'ASC' if since is not None else 'DESC'} LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+            return self._page([row[0] for row in rows], [self._load(row[1]) for row in rows],
+                              total, offset, since)
+
+    def _page(self, ids: List[int], items: List, total: int, offset: int, since: Optional[int]) -> Dict:
+        has_more = offset + len(ids) < total
+        # A since page that stops early resumes after its last item
+        cursor = ids[-1] if since is not None and has_more else self.last_id
+        return {"ids": ids, "items": items, "total": total, "cursor": cursor, "has_more": has_more}
+
+    def __len__(self) -> int:
+        return self._count
@@ -0,0 +1,255 @@
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from metrics import PROVIDER_IN_FLIGHT, QUEUE_DEPTH, QUEUE_WAIT
+from provider_health import provider_of
+
+# Queue order: lower rank is admitted first
+URGENCY_RANK = {'high': 0, 'medium': 1, 'low': 2}
+
+# Per provider (concurrency cap, requests per minute); rpm 0 means no rate limit
+DEFAULT_LIMITS = {'openai': (32, 0), 'anthropic': (16, 0), 'xai': (16, 0)}
+DEFAULT_LIMIT = (16, 0)
+
+WAITING = 'waiting'
+GRANTED = 'granted'
+GONE = 'gone'
+
+
+def urgency_of(value) -> str:
+    urgency = str(value or 'Medium').strip().lower()
+    return urgency if urgency in URGENCY_RANK else 'medium'
+
+
+def parse_limits(text: str) -> Dict:
+    """
+    Parse 'openai=32:500,anthropic=16:50' (provider=concurrency:rpm, rpm
+    optional) into {provider: (concurrency, rpm)}. '*' sets the default for
+    providers not listed.
+    """
+    limits = {}
+    for item in (text or '').split(','):
+        if not item.strip():
+            continue
+        provider, _, spec = item.partition('=')
+        concurrency, _, rpm = spec.partition(':')
+        if not provider.strip() or not concurrency.strip():
+            raise ValueError(f"Bad provider limit {item.strip()!r}, expected provider=concurrency:rpm")
+        limits[provider.strip()] = (int(concurrency), float(rpm or 0))
+    return limits
+
+
+class TokenBucket:
+    """
+    Refills rate tokens per second up to burst. A rate of 0 never limits.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    @property
+    def interval(self) -> Optional[float]:
+        return 1 / self.rate if self.rate else None
+
+    def _refill(self, now: float):
+        if self.rate:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """
+        Seconds until a token is available (0 when one is).
+        """
+        if not self.rate:
+            return 0.0
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float):
+        if self.rate:
+            self._refill(now)
+            self.tokens -= 1
+
+
+class _Waiter:
+    __slots__ = ('key', 'urgency', 'enqueued', 'loop', 'future', 'state')
+
+    def __init__(self, key: tuple, urgency: str, enqueued: float, loop, future):
+        self.key = key
+        self.urgency = urgency
+        self.enqueued = enqueued
+        self.loop = loop
+        self.future = future
+        self.state = WAITING
+
+    def __lt__(self, other: '_Waiter') -> bool:
+        return self.key < other.key
+
+
+class _Lane:
+    """
+    One provider: its queue, concurrency cap and token bucket.
+    """
+
+    def __init__(self, provider: str, concurrency: int, rpm: float):
+        self.provider = provider
+        self.concurrency = max(1, concurrency)
+        self.rpm = rpm
+        # Up to one full round of concurrent calls may start at once
+        self.bucket = TokenBucket(rpm / 60.0, burst=min(self.concurrency, rpm) if rpm else 1)
+        self.queue = []
+        self.queued = {urgency: 0 for urgency in URGENCY_RANK}
+        self.in_flight = 0
+        self.admitted = 0
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class AdmissionScheduler:
+    """
+    Admission control for provider calls. Each provider (model prefix, e.g.
+    'openai') has a concurrency cap and a token bucket refilled at its
+    requests-per-minute limit; calls beyond either wait in a priority queue.
+    The queue is ordered by urgency and age: a call's key is its enqueue time
+    plus urgency rank * aging seconds, so High goes first but a Low call that
+    has waited 2 * aging seconds is not overtaken by a fresh High one.
+    """
+
+    def __init__(self, limits: Dict = None, default_limit: tuple = DEFAULT_LIMIT, aging: float = 10.0):
+        self.limits = dict(DEFAULT_LIMITS)
+        self.limits.update(limits or {})
+        self.default_limit = self.limits.pop('*', default_limit)
+        self.aging = aging
+        self._lanes = {}
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def _lane(self, provider: str) -> _Lane:
+        lane = self._lanes.get(provider)
+        if lane is None:
+            concurrency, rpm = self.limits.get(provider, self.default_limit)
+            lane = self._lanes[provider] = _Lane(provider, concurrency, rpm)
+        return lane
+
+    def _dequeued(self, lane: _Lane, waiter: _Waiter):
+        lane.queued[waiter.urgency] -= 1
+        QUEUE_DEPTH.dec(provider=lane.provider, urgency=waiter.urgency)
+
+    def _dispatch(self, lane: _Lane, now: float) -> Optional[float]:
+        """
+        Admit queued calls while the provider has room. Returns the seconds
+        until the next token when the head of the queue waits on the rate limit.
+        Called with the lock held.
+        """
+        while lane.queue:
+            waiter = lane.queue[0]
+            if waiter.state != WAITING:
+                heapq.heappop(lane.queue)
+                continue
+            if lane.in_flight >= lane.concurrency:
+                return None
+            wait = lane.bucket.wait_time(now)
+            if wait > 0:
+                return wait
+            heapq.heappop(lane.queue)
+            lane.bucket.take(now)
+            lane.in_flight += 1
+            lane.admitted += 1
+            PROVIDER_IN_FLIGHT.set(lane.in_flight, provider=lane.provider)
+            waiter.state = GRANTED
+            self._dequeued(lane, waiter)
+            waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+        return None
+
+    def _release(self, lane: _Lane):
+        lane.in_flight -= 1
+        PROVIDER_IN_FLIGHT.set(lane.in_flight, provider=lane.provider)
+        self._dispatch(lane, time.monotonic())
+
+    @asynccontextmanager
+    async def slot(self, model: str, urgency: str = None):
+        """
+        Hold one of the provider's call slots for the duration of the block,
+        waiting in the queue first if the provider is at its limits.
+        """
+        loop = asyncio.get_running_loop()
+        urgency = urgency_of(urgency)
+        now = time.monotonic()
+        waiter = _Waiter(
+            (now + URGENCY_RANK[urgency] * self.aging, next(self._sequence)),
+            urgency, now, loop, loop.create_future()
+        )
+        with self._lock:
+            lane = self._lane(provider_of(model))
+            heapq.heappush(lane.queue, waiter)
+            lane.queued[urgency] += 1
+            QUEUE_DEPTH.inc(provider=lane.provider, urgency=urgency)
+            retry_in = self._dispatch(lane, now)
+
+        try:
+            while waiter.state != GRANTED:
+                # A release admits the next call; only the rate limit needs polling
+                try:
+                    await asyncio.wait_for(asyncio.shield(waiter.future), retry_in or lane.bucket.interval)
+                except asyncio.TimeoutError:
+                    pass
+                with self._lock:
+                    retry_in = self._dispatch(lane, time.monotonic())
+        except BaseException:
+            with self._lock:
+                if waiter.state == WAITING:
+                    waiter.state = GONE
+                    self._dequeued(lane, waiter)
+                    self._dispatch(lane, time.monotonic())
+                else:
+                    self._release(lane)
+            raise
+
+        QUEUE_WAIT.observe(time.monotonic() - waiter.enqueued, provider=lane.provider, urgency=urgency)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._release(lane)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                provider: {
+                    "concurrency": lane.concurrency,
+                    "rpm": lane.rpm,
+                    "in_flight": lane.in_flight,
+                    "queued": dict(lane.queued),
+                    "admitted": lane.admitted
+                }
+                for provider, lane in sorted(self._lanes.items())
+            }
+
+
+def create_admission_scheduler() -> Optional[AdmissionScheduler]:
+    """
+    AdmissionScheduler configured from the environment, or None when
+    QUORUM_SCHEDULER is 'off'.
+    """
+    if os.getenv('QUORUM_SCHEDULER', 'on').lower() == 'off':
+        return None
+    return AdmissionScheduler(
+        limits=parse_limits(os.getenv('QUORUM_PROVIDER_LIMITS', '')),
+        aging=float(os.getenv('QUORUM_SCHEDULER_AGING', '10'))
+    )
+
+
+# Shared by every consensus system in the process, like provider_health
+admission_scheduler = create_admission_scheduler()
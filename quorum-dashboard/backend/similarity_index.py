@@ -0,0 +1,193 @@
+import json
+import math
+import os
+import random
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Optional
+
+from decision_cache import normalize_request
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our so that the this to "
+    "we will with".split()
+)
+_PRIME = (1 << 61) - 1
+
+
+def tokenize(purchase_request: Dict) -> FrozenSet[str]:
+    """
+    Content words of the purpose and justification.
+    """
+    text = f"{purchase_request.get('purpose', '')} {purchase_request.get('justification', '')}".lower()
+    return frozenset(token for token in _TOKEN.findall(text) if token not in _STOPWORDS)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    # Two wordless requests say nothing about each other
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def request_context(purchase_request: Dict) -> tuple:
+    """
+    The fields besides the wording and amounts that must match exactly for a
+    decision to carry over: who is asking and how urgently.
+    """
+    normalized = normalize_request(purchase_request)
+    return normalized['requesting_agent'], normalized['urgency']
+
+
+class SimilarityIndex:
+    """
+    Local near-duplicate index over past decisions. Requests are matched on the
+    words of their purpose and justification (MinHash + LSH buckets to find
+    candidates, exact Jaccard to score them) and must fall in the same or an
+    adjacent amount band, with amounts within amount_tolerance of each other.
+    They must also come from the same requesting agent at the same urgency,
+    with remaining budgets within amount_tolerance (or both unknown).
+    Requests with no content words are neither indexed nor matched.
+
+    find() returns the best prior decision whose similarity is at least
+    threshold, or None so the request goes to the quorum.
+    """
+
+    def __init__(self, threshold: float = 0.7, amount_tolerance: float = 0.2,
+                 max_entries: int = 5000, num_perm: int = 64, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.amount_tolerance = amount_tolerance
+        self.max_entries = max_entries
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(0)
+        self._perms = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self._entries = OrderedDict()  # decision_id -> (tokens, amount, budget, bucket keys, result JSON)
+        self._buckets = {}  # bucket key -> set of decision ids
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _amount_band(self, amount: float) -> int:
+        return int(math.floor(math.log(max(amount, 1.0), 1 + self.amount_tolerance)))
+
+    def _signature(self, tokens: FrozenSet[str]):
+        hashes = [zlib.crc32(token.encode('utf-8')) for token in tokens] or [0]
+        return [min((a * h + b) % _PRIME for h in hashes) for a, b in self._perms]
+
+    def _band_keys(self, tokens: FrozenSet[str]):
+        signature = self._signature(tokens)
+        return [
+            (band, hash(tuple(signature[band * self.rows:(band + 1) * self.rows])))
+            for band in range(self.bands)
+        ]
+
+    @staticmethod
+    def _amount(purchase_request: Dict) -> Optional[float]:
+        try:
+            return float(purchase_request.get('amount'))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _budget(purchase_request: Dict):
+        # A number, or the normalized text (e.g. 'unknown') when it is not one
+        return normalize_request(purchase_request)['budget_remaining']
+
+    def _close(self, a: float, b: float) -> bool:
+        return abs(a - b) <= self.amount_tolerance * max(abs(a), abs(b))
+
+    def _budgets_match(self, a, b) -> bool:
+        if isinstance(a, str) or isinstance(b, str):
+            return a == b
+        return self._close(a, b)
+
+    def add(self, purchase_request: Dict, result: Dict):
+        """
+        Remember a decision; result must carry a decision_id.
+        """
+        amount = self._amount(purchase_request)
+        tokens = tokenize(purchase_request)
+        if amount is None or not tokens or not result.get('decision_id'):
+            return
+        prefix = (request_context(purchase_request), self._amount_band(amount))
+        keys = [prefix + key for key in self._band_keys(tokens)]
+        payload = json.dumps(result)
+        with self._lock:
+            decision_id = result['decision_id']
+            if decision_id in self._entries:
+                return
+            self._entries[decision_id] = (tokens, amount, self._budget(purchase_request), keys, payload)
+            for key in keys:
+                self._buckets.setdefault(key, set()).add(decision_id)
+            while len(self._entries) > self.max_entries:
+                old_id, (_, _, _, old_keys, _) = self._entries.popitem(last=False)
+                for key in old_keys:
+                    bucket = self._buckets.get(key)
+                    if bucket is not None:
+                        bucket.discard(old_id)
+                        if not bucket:
+                            del self._buckets[key]
+
+    def find(self, purchase_request: Dict):
+        """
+        Returns (prior result, similarity) for the closest match at or above
+        the threshold, or (None, best similarity seen).
+        """
+        amount = self._amount(purchase_request)
+        tokens = tokenize(purchase_request)
+        if amount is None or not tokens:
+            return None, 0.0
+        context = request_context(purchase_request)
+        budget = self._budget(purchase_request)
+        amount_band = self._amount_band(amount)
+        band_keys = self._band_keys(tokens)
+
+        best_id, best_similarity, best_payload = None, 0.0, None
+        with self._lock:
+            candidates = set()
+            for neighbour in (amount_band - 1, amount_band, amount_band + 1):
+                for key in band_keys:
+                    candidates.update(self._buckets.get((context, neighbour) + key, ()))
+            for decision_id in candidates:
+                other_tokens, other_amount, other_budget, _, payload = self._entries[decision_id]
+                if not self._close(other_amount, amount) or not self._budgets_match(other_budget, budget):
+                    continue
+                similarity = jaccard(tokens, other_tokens)
+                if similarity > best_similarity:
+                    best_id, best_similarity, best_payload = decision_id, similarity, payload
+
+            if best_id is None or best_similarity < self.threshold:
+                self.misses += 1
+                return None, best_similarity
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+        return json.loads(best_payload), best_similarity
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "threshold": self.threshold,
+                "amount_tolerance": self.amount_tolerance,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+def create_similarity_index() -> Optional[SimilarityIndex]:
+    """
+    Index configured from the environment; None unless QUORUM_SIMILARITY=on.
+    """
+    if os.getenv('QUORUM_SIMILARITY', 'off').lower() not in ('on', 'true', '1'):
+        return None
+    return SimilarityIndex(
+        threshold=float(os.getenv('QUORUM_SIMILARITY_THRESHOLD', '0.7')),
+        amount_tolerance=float(os.getenv('QUORUM_SIMILARITY_AMOUNT_TOLERANCE', '0.2')),
+        max_entries=int(os.getenv('QUORUM_SIMILARITY_SIZE', '5000'))
+    )
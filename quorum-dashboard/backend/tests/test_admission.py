@@ -0,0 +1,65 @@
+import asyncio
+import os
+import sys
+import unittest
+
+os.environ.setdefault('QUORUM_POLICY_PATH', 'none')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concensus import AgentConsensusSystem
+from fake_dedalus import FakeDedalus, FakeDedalusRunner
+from provider_health import ProviderHealth
+from scheduler import AdmissionScheduler
+
+
+class QueuedCallTest(unittest.TestCase):
+    """
+    A call waiting for its provider's slot is not slow yet: it must not be
+    hedged, time out or hold the circuit breaker's trial slot.
+    """
+
+    def make_system(self, **kwargs):
+        self.runner = FakeDedalusRunner(latency_scale=0.01, seed=1)
+        self.scheduler = AdmissionScheduler(limits={'anthropic': (1, 0)})
+        return AgentConsensusSystem(client=FakeDedalus(), runner=self.runner, scheduler=self.scheduler,
+                                    cache=None, **kwargs)
+
+    async def run_while_lane_busy(self, system, busy_for: float, probe=None):
+        agent = next(agent for agent in system.agents if agent['model'].startswith('anthropic/'))
+
+        async def hold_slot():
+            async with self.scheduler.slot(agent['model']):
+                await asyncio.sleep(busy_for)
+
+        holder = asyncio.ensure_future(hold_slot())
+        await asyncio.sleep(0)
+        call = asyncio.ensure_future(system._run_with_hedge(agent, "Vote on this."))
+        await asyncio.sleep(busy_for / 2)
+        probed = probe() if probe else None
+        await holder
+        return await call, probed
+
+    def test_queue_wait_does_not_hedge_or_time_out(self):
+        system = self.make_system(health=ProviderHealth(), hedge_after=0.05, agent_timeout=0.2)
+        (_, source, _), _ = asyncio.run(self.run_while_lane_busy(system, busy_for=0.4))
+        self.assertEqual(source, 'primary')
+        self.assertEqual(self.runner.calls, 1)
+
+    def test_queued_call_does_not_take_the_trial_slot(self):
+        health = ProviderHealth(failure_threshold=1, reset_timeout=0.01)
+        health.record_failure('anthropic/any', ConnectionError("down"))
+        system = self.make_system(health=health, hedge_after=None, agent_timeout=None)
+
+        async def scenario():
+            await asyncio.sleep(0.02)
+            return await self.run_while_lane_busy(system, busy_for=0.2,
+                                                  probe=lambda: health.available('anthropic/any'))
+
+        (_, source, _), available_while_queued = asyncio.run(scenario())
+        self.assertTrue(available_while_queued)
+        self.assertEqual(source, 'primary')
+        self.assertEqual(health.stats()['anthropic']['state'], 'closed')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import os
+import sys
+import unittest
+
+os.environ.setdefault('QUORUM_POLICY_PATH', 'none')
+os.environ.setdefault('QUORUM_RESULTS_DB', 'none')
+os.environ.setdefault('QUORUM_CACHE', 'none')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api
+
+LARGE_BODY = {"items": ["x" * 100] * 50}
+
+
+class JsonResponseTest(unittest.TestCase):
+
+    def coding_for(self, accept_encoding: str):
+        headers = {'Accept-Encoding': accept_encoding} if accept_encoding is not None else {}
+        with api.app.test_request_context(headers=headers):
+            return api._json_response(LARGE_BODY).headers.get('Content-Encoding')
+
+    def test_gzip_only_when_accepted(self):
+        cases = [
+            ('gzip', 'gzip'),
+            ('gzip, deflate, br', 'gzip'),
+            ('*', 'gzip'),
+            ('gzip;q=0', None),
+            ('identity, gzip;q=0', None),
+            ('*, gzip;q=0', None),
+            ('deflate', None),
+            (None, None),
+        ]
+        for accept_encoding, expected in cases:
+            with self.subTest(accept_encoding=accept_encoding):
+                self.assertEqual(self.coding_for(accept_encoding), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import asyncio
+import json
+import os
+import sys
+import unittest
+
+os.environ.setdefault('QUORUM_POLICY_PATH', 'none')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concensus import AgentConsensusSystem
+from fake_dedalus import DEFAULT_PROFILE, FakeDedalus, FakeDedalusRunner
+from provider_health import ProviderHealth
+
+# Batched answer with a string and a null risk score
+CANNED_BATCH = json.dumps([
+    {"request_id": "R1", "vote": "YES", "reasoning": "fine", "risk_score": "7", "conditions": None},
+    {"request_id": "R2", "vote": "NO", "reasoning": "no", "risk_score": None, "conditions": ""}
+])
+
+
+def make_system(output: str) -> AgentConsensusSystem:
+    runner = FakeDedalusRunner(latency_scale=0.001, seed=1)
+    system = AgentConsensusSystem(client=FakeDedalus(), runner=runner, health=ProviderHealth(),
+                                  coalesce=False)
+    for agent in system.agents:
+        for model in (agent['model'], agent.get('fallback_model')):
+            if model:
+                runner.profiles[model] = dict(DEFAULT_PROFILE, output=output)
+    return system
+
+
+def purchase_request(i: int) -> dict:
+    return {
+        "amount": 100 + i,
+        "purpose": f"Test purchase {i}",
+        "justification": "Regression test",
+        "requesting_agent": "Test Agent",
+        "urgency": "Medium"
+    }
+
+
+class BatchedVoteTest(unittest.TestCase):
+
+    def test_risk_scores_are_normalized(self):
+        system = make_system(CANNED_BATCH)
+        votes = system._parse_agent_batch_response(CANNED_BATCH, system.agents[0], ["R1", "R2"])
+        self.assertEqual(votes["R1"]["risk_score"], 7)
+        self.assertEqual(votes["R2"]["risk_score"], 5)
+        self.assertEqual(votes["R1"]["conditions"], "")
+
+    def test_batched_prompt_with_odd_risk_scores(self):
+        system = make_system(CANNED_BATCH)
+        results = asyncio.run(system.evaluate_batch(
+            [purchase_request(0), purchase_request(1)], votes_per_prompt=2
+        ))
+        self.assertTrue(all(item["success"] for item in results), results)
+        self.assertTrue(results[0]["result"]["approved"])
+        self.assertFalse(results[1]["result"]["approved"])
+        self.assertEqual(results[0]["result"]["average_risk_score"], 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
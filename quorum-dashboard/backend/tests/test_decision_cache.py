@@ -0,0 +1,67 @@
+import asyncio
+import os
+import sys
+import unittest
+
+os.environ.setdefault('QUORUM_POLICY_PATH', 'none')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concensus import AgentConsensusSystem
+from decision_cache import MemoryDecisionCache
+from fake_dedalus import FakeDedalus, FakeDedalusRunner
+from provider_health import ProviderHealth
+
+REQUEST = {
+    "amount": 20,
+    "purpose": "Office plants",
+    "justification": "Regression test",
+    "requesting_agent": "Test Agent",
+    "urgency": "Low"
+}
+
+
+class EarlyExitCachingTest(unittest.TestCase):
+
+    def make_system(self, finish_in_background: bool):
+        runner = FakeDedalusRunner(latency_scale=0.01, yes_rate=1.0, seed=1)
+        system = AgentConsensusSystem(client=FakeDedalus(), runner=runner, health=ProviderHealth(),
+                                      cache=MemoryDecisionCache(), finish_in_background=finish_in_background)
+        # Two slow agents, so three fast YES votes settle the quorum without them
+        for agent in system.agents[-2:]:
+            runner.profiles[agent['model']] = {"median": 30.0, "sigma": 0.01}
+        return system
+
+    def test_partial_decision_is_not_served_to_a_full_quorum_caller(self):
+        system = self.make_system(finish_in_background=False)
+
+        async def scenario():
+            partial = await system.evaluate_purchase(dict(REQUEST), early_exit=True)
+            full = await system.evaluate_purchase(dict(REQUEST), early_exit=False)
+            again = await system.evaluate_purchase(dict(REQUEST), early_exit=False)
+            return partial, full, again
+
+        partial, full, again = asyncio.run(scenario())
+        self.assertTrue(partial['early_exit'])
+        self.assertFalse(full.get('cached'))
+        self.assertEqual(len(full['agent_votes']), len(system.agents))
+        self.assertTrue(again.get('cached'))
+
+    def test_decision_is_cached_once_late_votes_are_in(self):
+        system = self.make_system(finish_in_background=True)
+
+        async def scenario():
+            partial = await system.evaluate_purchase(dict(REQUEST), early_exit=True)
+            uncached = await system.evaluate_purchase(dict(REQUEST), early_exit=True)
+            while system._background_tasks:
+                await asyncio.sleep(0.05)
+            cached = await system.evaluate_purchase(dict(REQUEST), early_exit=False)
+            return partial, uncached, cached
+
+        partial, uncached, cached = asyncio.run(scenario())
+        self.assertFalse(uncached.get('cached'))
+        self.assertTrue(cached.get('cached'))
+        self.assertEqual(len(cached['agent_votes']) + len(cached['late_votes']), len(system.agents))
+
+
+if __name__ == '__main__':
+    unittest.main()
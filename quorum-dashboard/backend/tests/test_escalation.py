@@ -0,0 +1,60 @@
+import asyncio
+import json
+import os
+import sys
+import unittest
+
+os.environ.setdefault('QUORUM_POLICY_PATH', 'none')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concensus import AgentConsensusSystem
+from escalation import load_tiers
+from fake_dedalus import FakeDedalus, FakeDedalusRunner
+from provider_health import ProviderHealth
+
+REQUEST = {
+    "amount": 50,
+    "purpose": "Team lunch",
+    "justification": "Regression test",
+    "requesting_agent": "Test Agent",
+    "urgency": "Medium"
+}
+
+
+class EscalationTest(unittest.TestCase):
+
+    def evaluate(self, vote: str, risk: int) -> dict:
+        """
+        Every agent answers the same vote and risk score under the shipped tiers.
+        """
+        answer = json.dumps({"vote": vote, "risk_score": risk, "reasoning": "Same for all", "conditions": ""})
+        system = AgentConsensusSystem(client=FakeDedalus(), runner=FakeDedalusRunner(latency_scale=0.01),
+                                      health=ProviderHealth(), cache=None,
+                                      tiers=load_tiers('escalation_tiers.json'))
+        system.runner.profiles = {
+            agent['model']: {"median": 1.0, "output": answer} for agent in system.agents
+        }
+        result = asyncio.run(system.evaluate_purchase(dict(REQUEST)))
+        result['calls'] = system.runner.calls
+        return result
+
+    def test_confident_agreement_decides_at_the_first_tier(self):
+        for vote, risk, approved in (('YES', 2, True), ('NO', 8, False)):
+            with self.subTest(vote=vote):
+                result = self.evaluate(vote, risk)
+                self.assertEqual(result['tiers_run'], ['fast'])
+                self.assertEqual(result['decided_at_tier'], 'fast')
+                self.assertEqual(result['approved'], approved)
+                self.assertEqual(result['calls'], 3)
+
+    def test_risky_agreement_escalates(self):
+        for vote, risk in (('YES', 9), ('NO', 2)):
+            with self.subTest(vote=vote):
+                result = self.evaluate(vote, risk)
+                self.assertEqual(result['tiers_run'], ['fast', 'expensive'])
+                self.assertNotIn('decided_at_tier', result)
+                self.assertEqual(result['calls'], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from event_loop import background_loop
+from jobs import JobManager
+
+
+class JobManagerTest(unittest.TestCase):
+
+    def test_on_complete_runs_off_the_event_loop(self):
+        manager = JobManager(max_workers=1, max_jobs=10)
+        stored = []
+
+        async def simulate():
+            return {"loop_thread": threading.current_thread()}
+
+        def store(result):
+            stored.append((result, threading.current_thread()))
+
+        job = manager.submit("Agent", "Goal", 100, run=lambda job: simulate(), on_complete=store)
+        deadline = time.monotonic() + 5
+        while not job.finished and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(job.status, 'completed')
+        (result, store_thread), = stored
+        self.assertIs(result, job.result)
+        self.assertIsNot(store_thread, result['loop_thread'])
+        self.assertIsNot(store_thread, background_loop._thread)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from result_store import ResultStore
+
+
+def poll_all(store: ResultStore, limit: int) -> list:
+    """
+    Follow the cursor from the start like a polling client would.
+    """
+    seen, cursor = [], 0
+    while True:
+        page = store.list(limit=limit, since=cursor)
+        seen.extend(page['ids'])
+        cursor = page['cursor']
+        if not page['has_more']:
+            return seen
+
+
+class CursorTest(unittest.TestCase):
+
+    def check_store(self, store: ResultStore):
+        for i in range(5):
+            store.append({"n": i}, requesting_agent='a' if i % 2 else 'b', approved=True)
+
+        page = store.list(limit=2, since=0)
+        self.assertEqual(page['ids'], [1, 2])
+        self.assertEqual(page['cursor'], 2)
+        self.assertTrue(page['has_more'])
+        self.assertEqual(poll_all(store, limit=2), [1, 2, 3, 4, 5])
+
+        done = store.list(limit=2, since=5)
+        self.assertEqual((done['ids'], done['cursor'], done['has_more']), ([], 5, False))
+        # Plain listings stay newest first
+        self.assertEqual(store.list(limit=2)['ids'], [5, 4])
+
+    def test_memory_store(self):
+        self.check_store(ResultStore('results'))
+
+    def test_sqlite_store_past_the_ring_buffer(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.check_store(ResultStore('results', path=os.path.join(tmp, 'results.db'), max_recent=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
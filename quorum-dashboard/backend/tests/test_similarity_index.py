@@ -0,0 +1,56 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from similarity_index import SimilarityIndex, jaccard
+
+BASE = {
+    "amount": 100,
+    "purpose": "Laptop charger replacement",
+    "justification": "The old charger stopped working",
+    "requesting_agent": "Operations",
+    "urgency": "Medium",
+    "budget_remaining": 5000
+}
+
+
+def _request(**changes):
+    request = dict(BASE)
+    request.update(changes)
+    return request
+
+
+class SimilarityIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SimilarityIndex()
+        self.index.add(BASE, {"decision_id": "d1", "approved": True, "purchase_request": BASE})
+
+    def test_matches_a_reworded_request(self):
+        source, similarity = self.index.find(_request(purpose="laptop  CHARGER replacement", amount=105))
+        self.assertEqual(source['decision_id'], 'd1')
+        self.assertEqual(similarity, 1.0)
+
+    def test_context_must_match(self):
+        for changes in ({"requesting_agent": "Growth"}, {"urgency": "High"},
+                        {"budget_remaining": 200}, {"budget_remaining": "Unknown"}, {"amount": 500}):
+            with self.subTest(changes=changes):
+                source, _ = self.index.find(_request(**changes))
+                self.assertIsNone(source)
+
+    def test_close_budget_matches(self):
+        source, _ = self.index.find(_request(budget_remaining=4800))
+        self.assertEqual(source['decision_id'], 'd1')
+
+    def test_wordless_requests_never_match(self):
+        self.assertEqual(jaccard(frozenset(), frozenset()), 0.0)
+        empty = _request(purpose="the", justification="")
+        self.index.add(empty, {"decision_id": "d2", "approved": False, "purchase_request": empty})
+        self.assertEqual(self.index.find(empty), (None, 0.0))
+        self.assertEqual(self.index.stats()['entries'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
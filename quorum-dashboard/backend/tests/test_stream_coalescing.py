@@ -0,0 +1,65 @@
+import asyncio
+import os
+import sys
+import unittest
+
+os.environ.setdefault('QUORUM_POLICY_PATH', 'none')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concensus import AgentConsensusSystem
+from fake_dedalus import FakeDedalus, FakeDedalusRunner
+from provider_health import ProviderHealth
+
+
+def purchase_request(amount: int, purpose: str) -> dict:
+    return {
+        "amount": amount,
+        "purpose": purpose,
+        "justification": "Regression test",
+        "requesting_agent": "Test Agent",
+        "urgency": "Medium"
+    }
+
+
+async def decision_of(system: AgentConsensusSystem, request: dict) -> dict:
+    decision = None
+    async for event in system.stream_evaluation(request):
+        if event['event'] == 'decision':
+            decision = event['data']
+    return decision
+
+
+class StreamCoalescingTest(unittest.TestCase):
+
+    def make_system(self):
+        # No cache: the coalescing key must not depend on the cache backend
+        self.runner = FakeDedalusRunner(latency_scale=0.01, seed=1)
+        return AgentConsensusSystem(client=FakeDedalus(), runner=self.runner, health=ProviderHealth(),
+                                    cache=None)
+
+    def test_different_requests_get_their_own_rounds(self):
+        system = self.make_system()
+        laptop, yacht = purchase_request(5, "Laptop"), purchase_request(9000, "Yacht")
+
+        async def both():
+            return await asyncio.gather(decision_of(system, laptop), decision_of(system, yacht))
+
+        first, second = asyncio.run(both())
+        self.assertEqual(first['purchase_request']['purpose'], "Laptop")
+        self.assertEqual(second['purchase_request']['purpose'], "Yacht")
+        self.assertEqual(self.runner.calls, 2 * len(system.agents))
+
+    def test_identical_requests_share_one_round(self):
+        system = self.make_system()
+
+        async def both():
+            return await asyncio.gather(decision_of(system, purchase_request(5, "Laptop")),
+                                        decision_of(system, purchase_request(5, "Laptop")))
+
+        first, second = asyncio.run(both())
+        self.assertEqual(first['decision_id'], second['decision_id'])
+        self.assertEqual(self.runner.calls, len(system.agents))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vote_parser import parse_vote_response
+
+# (answer, expected vote or None for no unambiguous vote)
+CASES = [
+    # JSON
+    ('{"vote": "YES", "reasoning": "fine", "risk_score": 3}', 'YES'),
+    ('Sure: {"vote": "no", "risk_score": "8"} hope that helps', 'NO'),
+    ('{"vote": "YES", "reasoning": "cut off', 'YES'),
+    ('{"reasoning": "looks fine"} VOTE: YES', 'YES'),
+    ('{"vote": "maybe"}', None),
+    # Labelled
+    ('After review.\nVote: NO\nToo expensive.', 'NO'),
+    ('**Vote:** YES', 'YES'),
+    ('vote = yes', 'YES'),
+    # Leading word
+    ('YES - this is within budget.', 'YES'),
+    ('No, not yes.', 'NO'),
+    # Negated or unlabelled
+    ('I would not vote yes on this.', None),
+    ('I vote yes', None),
+    ('Hard to say either way.', None),
+    # Conflicting
+    ('Vote: YES ... on reflection, Vote: NO', None),
+    ('YES. Final vote: NO', None),
+]
+
+
+class ParseVoteResponseTest(unittest.TestCase):
+
+    def test_cases(self):
+        for answer, expected in CASES:
+            with self.subTest(answer=answer):
+                parsed = parse_vote_response(answer)
+                self.assertEqual(parsed and parsed['vote'], expected)
+
+    def test_json_fields_survive_the_text_fallback(self):
+        parsed = parse_vote_response('{"reasoning": "looks fine", "risk_score": 2} VOTE: YES')
+        self.assertEqual((parsed['reasoning'], parsed['risk_score']), ("looks fine", 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
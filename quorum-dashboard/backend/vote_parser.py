@@ -0,0 +1,161 @@
+import json
+import re
+from typing import Dict, List, Optional
+
+VOTES = ('YES', 'NO')
+
+_decoder = json.JSONDecoder()
+
+# Field patterns that also match inside incomplete (still streaming) JSON
+_VOTE_FIELD = re.compile(r'"vote"\s*:\s*"\s*(YES|NO)\s*"', re.IGNORECASE)
+_RISK_FIELD = re.compile(r'"risk_score"\s*:\s*"?(\d+(?:\.\d+)?)')
+_REASONING_FIELD = re.compile(r'"reasoning"\s*:\s*"((?:[^"\\]|\\.)*)("?)', re.DOTALL)
+_CONDITIONS_FIELD = re.compile(r'"conditions"\s*:\s*"((?:[^"\\]|\\.)*)("?)', re.DOTALL)
+
+# Plain-text answers: the vote must lead the answer or follow a "vote:" (or
+# "vote =") label, so "NO, not YES" reads as NO and "I would not vote yes"
+# is no vote at all. Markdown emphasis around the label is allowed.
+_LEADING_VOTE = re.compile(r'^\W*(YES|NO)\b', re.IGNORECASE)
+_LABELLED_VOTE = re.compile(r'\bvote\**\s*[:=]\s*\**\s*(YES|NO)\b', re.IGNORECASE)
+
+
+def normalize_vote(value) -> Optional[str]:
+    vote = str(value or '').strip().strip('.').upper()
+    return vote if vote in VOTES else None
+
+
+def _risk(value) -> Optional[float]:
+    try:
+        risk = float(value)
+    except (TypeError, ValueError):
+        return None
+    return int(risk) if risk.is_integer() else risk
+
+
+def _decode_all(text: str, opener: str):
+    """
+    Yield every JSON value starting at an `opener` character that decodes cleanly.
+    """
+    index = text.find(opener)
+    while index != -1:
+        try:
+            value, end = _decoder.raw_decode(text, index)
+            yield value
+            index = text.find(opener, end)
+        except ValueError:
+            index = text.find(opener, index + 1)
+
+
+def extract_json_object(text: str) -> Optional[Dict]:
+    """
+    The first JSON object in text that carries a "vote" key (or the first
+    object at all), ignoring prose and stray braces around it.
+    """
+    first = None
+    for value in _decode_all(text, '{'):
+        if isinstance(value, dict):
+            if 'vote' in value:
+                return value
+            if first is None:
+                first = value
+    return first
+
+
+def extract_json_array(text: str) -> Optional[List]:
+    """
+    The first JSON array of objects in text.
+    """
+    for value in _decode_all(text, '['):
+        if isinstance(value, list) and all(isinstance(item, dict) for item in value):
+            return value
+    return None
+
+
+def _unescape(fragment: str) -> str:
+    try:
+        return json.loads(f'"{fragment}"')
+    except ValueError:
+        return fragment.replace('\\"', '"').replace('\\n', '\n')
+
+
+def parse_vote_response(text: str) -> Optional[Dict]:
+    """
+    Strict vote parsing. Tries, in order: a complete JSON object, the fields of
+    truncated JSON (e.g. a stream stopped once the vote was known), then a
+    plain-text answer that leads with or labels its vote. A JSON object
+    without a usable vote falls through to the text checks. Returns a dict
+    with vote/reasoning/risk_score/conditions (missing ones set to None), or
+    None when no unambiguous YES/NO vote is present - including text whose
+    votes contradict each other.
+    """
+    text = text or ''
+
+    parsed = extract_json_object(text)
+    vote = normalize_vote(parsed.get('vote')) if parsed is not None else None
+    if vote is not None:
+        return {
+            "vote": vote,
+            "reasoning": parsed.get('reasoning'),
+            "risk_score": _risk(parsed.get('risk_score')),
+            "conditions": parsed.get('conditions')
+        }
+
+    match = _VOTE_FIELD.search(text)
+    if match:
+        risk = _RISK_FIELD.search(text)
+        reasoning = _REASONING_FIELD.search(text)
+        conditions = _CONDITIONS_FIELD.search(text)
+        return {
+            "vote": match.group(1).upper(),
+            "reasoning": _unescape(reasoning.group(1)) if reasoning else None,
+            "risk_score": _risk(risk.group(1)) if risk else None,
+            "conditions": _unescape(conditions.group(1)) if conditions and conditions.group(2) else None
+        }
+
+    leading = _LEADING_VOTE.search(text)
+    votes = {match.upper() for match in _LABELLED_VOTE.findall(text)}
+    if leading:
+        votes.add(leading.group(1).upper())
+    if len(votes) == 1:
+        return {
+            "vote": votes.pop(),
+            "reasoning": (parsed or {}).get('reasoning') or text.strip()[:200],
+            "risk_score": _risk((parsed or {}).get('risk_score')),
+            "conditions": (parsed or {}).get('conditions')
+        }
+    return None
+
+
+class IncrementalVoteParser:
+    """
+    Accumulates streamed text and reports the vote and risk score as soon as
+    both have appeared, so a vote-only caller can stop the stream early.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._tail = ''
+        self.vote = None
+        self.risk_score = None
+
+    def feed(self, chunk: str):
+        self._chunks.append(chunk)
+        # Only rescan the recent text; field values are short
+        self._tail = (self._tail + chunk)[-2048:]
+        if self.vote is None:
+            match = _VOTE_FIELD.search(self._tail)
+            if match:
+                self.vote = match.group(1).upper()
+        if self.risk_score is None:
+            # Require a delimiter after the number so "1" of "10" is not taken early
+            match = re.search(r'"risk_score"\s*:\s*"?(\d+(?:\.\d+)?)\s*[",}\n]', self._tail)
+            if match:
+                self.risk_score = _risk(match.group(1))
+
+    @property
+    def has_vote_and_risk(self) -> bool:
+        return self.vote is not None and self.risk_score is not None
+
+    @property
+    def text(self) -> str:
+        return ''.join(self._chunks)